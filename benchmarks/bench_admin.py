@@ -0,0 +1,52 @@
+"""Время changelist постов в админке на большой таблице.
+
+    python benchmarks/bench_admin.py --posts 1000000
+"""
+import argparse
+
+from common import measure, setup_django
+from run import PASSWORD, seed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=200000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def main():
+    options = parse_args()
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+    from django.test.utils import teardown_test_environment
+    from django.urls import reverse
+
+    # Как в продакшене: с DEBUG = False шаблоны не разбираются заново
+    # на каждый запрос, а тестовый клиент не копирует контекст каждого
+    # из сотен шаблонов виджетов.
+    teardown_test_environment()
+    settings.DEBUG = False
+    author = seed(options)
+    author.is_staff = author.is_superuser = True
+    author.save()
+    client = Client()
+    client.login(username=author.username, password=PASSWORD)
+    url = reverse('admin:posts_post_changelist')
+    pages = {
+        'changelist': url,
+        'changelist, стр. 100': f'{url}?p=99',
+        'поиск': f'{url}?q=и',
+        'сортировка по группе': f'{url}?o=5',
+    }
+    print(f'{options.posts} постов')
+    for name, page in pages.items():
+        assert client.get(page).status_code == 200, page
+        print(f'{name:>22}: {measure(lambda: client.get(page), 10):.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
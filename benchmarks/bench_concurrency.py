@@ -0,0 +1,107 @@
+"""Пропускная способность WSGI-приложения под конкурентной нагрузкой.
+
+Поднимает многопоточный WSGI-сервер на тестовой базе в файле и
+запрашивает ленты, страницу поста и about параллельно из нескольких
+потоков. Показывает, сколько запросов в секунду выдерживает WSGI-путь
+при разной конкурентности:
+
+    python benchmarks/bench_concurrency.py --posts 100000 --concurrency 1 8 32
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from urllib.request import Request, urlopen
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from common import setup_django
+from run import percentile, seed
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--groups', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=400,
+                        help='Запросов на каждый уровень конкурентности')
+    parser.add_argument('--concurrency', type=int, nargs='+',
+                        default=[1, 4, 16])
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def read_urls(author):
+    from django.urls import reverse
+
+    post = author.posts.first()
+    group = post.group or author.posts.exclude(group=None).first().group
+    return [
+        reverse('posts:index'),
+        reverse('posts:index') + '?page=50',
+        reverse('posts:group_list', args=[group.slug]),
+        reverse('posts:profile', args=[author.username]),
+        reverse('posts:post_detail', args=[post.pk]),
+        reverse('about:author'),
+        reverse('about:tech'),
+    ]
+
+
+def fetch(url):
+    start = time.perf_counter()
+    with urlopen(Request(url, headers={'Host': 'testserver'})) as response:
+        response.read()
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_level(base, urls, requests, concurrency):
+    targets = [base + urls[i % len(urls)] for i in range(requests)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        timings = list(pool.map(fetch, targets))
+    total = time.perf_counter() - started
+    return requests / total, statistics.median(timings), \
+        percentile(timings, 0.95)
+
+
+def main():
+    options = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, 'bench.sqlite3'))
+        from django.core.wsgi import get_wsgi_application
+
+        author = seed(options)
+        urls = read_urls(author)
+        server = make_server('127.0.0.1', 0, get_wsgi_application(),
+                             server_class=ThreadingWSGIServer,
+                             handler_class=QuietHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{server.server_port}'
+        for url in urls:
+            fetch(base + url)
+        print(f'{"потоков":>8} {"запр/с":>10} {"p50, мс":>10} {"p95, мс":>10}')
+        for concurrency in options.concurrency:
+            rps, p50, p95 = bench_level(base, urls, options.requests,
+                                        concurrency)
+            print(f'{concurrency:>8} {rps:>10.1f} {p50:>10.2f} {p95:>10.2f}')
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
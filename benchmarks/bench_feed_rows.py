@@ -0,0 +1,51 @@
+"""Память и время на страницу ленты: модели ORM против записей FeedPost.
+
+    python benchmarks/bench_feed_rows.py [постов на странице]
+"""
+import sys
+import tracemalloc
+
+from common import measure, setup_django
+
+
+def main(per_page):
+    setup_django()
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Group, Post
+
+    author = get_user_model().objects.create(
+        username='bench', first_name='Имя', last_name='Фамилия')
+    group = Group.objects.create(title='группа', slug='bench',
+                                 description='Описание группы ' * 50)
+    Post.objects.bulk_create(
+        Post(text=f'Пост {i} ' * 20, author=author, group=group)
+        for i in range(per_page)
+    )
+
+    def read_page(queryset):
+        # То, что читают карточка и фиды.
+        return [
+            (post.pk, post.text, post.pub_date, post.updated_at,
+             post.author.username, post.author.get_full_name(),
+             post.group and post.group.slug)
+            for post in queryset.order_by('-pub_date', '-pk')[:per_page]
+        ]
+
+    variants = {
+        'ORM Post': Post.objects.for_feed,
+        'FeedPost': Post.objects.compact,
+    }
+    print(f'{per_page} постов на странице')
+    for name, queryset in variants.items():
+        elapsed = measure(lambda: read_page(queryset()))
+        tracemalloc.start()
+        posts = list(queryset().order_by('-pub_date', '-pk')[:per_page])
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del posts
+        print(f'{name:>9}: {elapsed:7.2f} ms, {size / 1024:8.1f} КиБ')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
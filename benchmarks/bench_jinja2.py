@@ -0,0 +1,82 @@
+"""Рендер posts/index.html на 100 постов: шаблоны Django против Jinja2.
+
+Оба движка берут уже разобранные шаблоны: Django — из кеширующего
+загрузчика, Jinja2 — из кеша окружения. У Django замер идёт дважды:
+с тёплым и с пустым фрагментным кешем карточек, у Jinja2 кеша
+карточек нет:
+
+    python benchmarks/bench_jinja2.py [постов на странице]
+"""
+import os
+import sys
+
+from common import measure, setup_django
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_backends():
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+    from django.template.backends.jinja2 import Jinja2
+
+    params = dict(settings.TEMPLATES[0], NAME='bench', APP_DIRS=False)
+    del params['BACKEND']
+    options = params['OPTIONS']
+    params['OPTIONS'] = dict(
+        options, debug=False,
+        loaders=[('django.template.loaders.cached.Loader', LOADERS)])
+    jinja = Jinja2({
+        'NAME': 'bench-jinja2', 'APP_DIRS': False,
+        'DIRS': [os.path.join(settings.BASE_DIR, 'jinja2')],
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'context_processors': options['context_processors'],
+        },
+    })
+    return DjangoTemplates(params), jinja
+
+
+def main(per_page):
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.test import RequestFactory
+
+    from posts.models import Group, Post
+    from posts.utils import paginate
+
+    author = get_user_model().objects.create(
+        username='bench', first_name='Имя', last_name='Фамилия')
+    group = Group.objects.create(title='группа', slug='bench')
+    Post.objects.bulk_create(
+        Post(text=f'Пост {i} ' * 20, author=author, group=group)
+        for i in range(per_page)
+    )
+    request = RequestFactory().get('/')
+    request.user = author
+    context = {
+        'page_obj': paginate(request, Post.objects.compact(), per_page),
+        'text': 'Последние обновления на сайте',
+    }
+    django, jinja = make_backends()
+
+    def render(backend):
+        backend.get_template('posts/index.html').render(context, request)
+
+    def render_django_cold():
+        cache.clear()
+        render(django)
+
+    render(django)
+    render(jinja)
+    print(f'django, warm cards: {measure(lambda: render(django)):.2f} ms')
+    print(f'django, cold cards: {measure(render_django_cold):.2f} ms')
+    print(f'jinja2:             {measure(lambda: render(jinja)):.2f} ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,53 @@
+"""Задержка глубоких страниц ленты: OFFSET/LIMIT против курсора.
+
+    python benchmarks/bench_pagination.py [количество постов]
+"""
+import sys
+
+from common import measure, setup_django
+
+PER_PAGE = 10
+
+
+def main(total):
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.paginator import Paginator
+
+    from posts.models import Post
+    from posts.paginators import CursorPaginator, encode_cursor, NEXT
+
+    author = get_user_model().objects.create(username='bench')
+    Post.objects.bulk_create(
+        Post(text=f'Пост {i}', author=author) for i in range(total)
+    )
+    queryset = Post.objects.all()
+    offset_paginator = Paginator(queryset.order_by('-pub_date', '-pk'),
+                                 PER_PAGE)
+    cursor_paginator = CursorPaginator(queryset, PER_PAGE)
+
+    print(f'{"page":>6} {"offset, ms":>12} {"cursor, ms":>12}')
+    last_page = total // PER_PAGE
+    for number in (1, 10, 100, 1000, last_page):
+        if number > last_page:
+            continue
+        anchor = cursor_paginator.object_list[(number - 1) * PER_PAGE - 1] \
+            if number > 1 else None
+        cursor = encode_cursor(NEXT, anchor) if anchor else None
+
+        def offset_page():
+            list(Paginator(offset_paginator.object_list, PER_PAGE)
+                 .page(number))
+
+        def cursor_page():
+            if cursor:
+                list(cursor_paginator.cursor_page(cursor))
+            else:
+                list(cursor_paginator.first_cursor_page())
+
+        print(f'{number:>6} {measure(offset_page):>12.2f} '
+              f'{measure(cursor_page):>12.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
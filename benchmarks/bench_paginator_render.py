@@ -0,0 +1,41 @@
+"""Время рендера пагинатора в зависимости от числа страниц.
+
+Сравнивает общий include posts/includes/paginator.html, который выводит
+окно страниц, со старым вариантом — ссылкой на каждую страницу:
+
+    python benchmarks/bench_paginator_render.py
+"""
+from common import measure, setup_django
+
+FULL_RANGE = '''
+{% for i in page_obj.paginator.page_range %}
+  {% if page_obj.number == i %}
+    <li class="page-item active"><span class="page-link">{{ i }}</span></li>
+  {% else %}
+    <li class="page-item">
+      <a class="page-link" href="?page={{ i }}">{{ i }}</a>
+    </li>
+  {% endif %}
+{% endfor %}
+'''
+
+
+def main():
+    setup_django()
+    from django.core.paginator import Paginator
+    from django.template import Context, Template
+    from django.template.loader import get_template
+
+    windowed = get_template('posts/includes/paginator.html')
+    full = Template(FULL_RANGE)
+    print(f'{"страниц":>9} {"окно, мс":>10} {"все, мс":>10}')
+    for num_pages in (10, 100, 1000, 10000, 100000):
+        page_obj = Paginator(range(num_pages), 1).page(num_pages // 2)
+        context = {'page_obj': page_obj}
+        windowed_ms = measure(lambda: windowed.render(context))
+        full_ms = measure(lambda: full.render(Context(context)), repeat=3)
+        print(f'{num_pages:>9} {windowed_ms:>10.3f} {full_ms:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Время рендера страницы ленты с холодным и тёплым кешем карточек.
+
+    python benchmarks/bench_post_cards.py [постов на странице]
+"""
+import sys
+
+from common import measure, setup_django
+
+
+def main(per_page):
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache
+    from django.template.loader import render_to_string
+    from django.test import RequestFactory
+
+    from posts.models import Group, Post
+    from posts.utils import paginate
+
+    author = get_user_model().objects.create(
+        username='bench', first_name='Имя', last_name='Фамилия')
+    group = Group.objects.create(title='группа', slug='bench')
+    Post.objects.bulk_create(
+        Post(text=f'Пост {i} ' * 20, author=author, group=group)
+        for i in range(per_page)
+    )
+    request = RequestFactory().get('/')
+    request.user = author
+
+    def render_page():
+        page_obj = paginate(request, Post.objects.for_feed(), per_page)
+        render_to_string('posts/index.html', {'page_obj': page_obj},
+                         request)
+
+    def render_cold():
+        cache.clear()
+        render_page()
+
+    print(f'cold cards: {measure(render_cold):.2f} ms per page')
+    render_page()
+    print(f'warm cards: {measure(render_page):.2f} ms per page')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,117 @@
+"""Конкурентные запись и чтение SQLite в профилях default и production.
+
+Каждый профиль прогоняется в отдельном процессе с YATUBE_DB_PROFILE на
+своей тестовой базе в файле. Писатели создают посты через /create/,
+читатели открывают главную; считаются операции в секунду и ошибки
+"database is locked":
+
+    python benchmarks/bench_sqlite_profile.py --writers 4 --readers 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from common import setup_django
+
+PROFILES = ('default', 'production')
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=5000)
+    parser.add_argument('--writers', type=int, default=4)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--profile', choices=PROFILES,
+                        help='Прогнать только этот профиль в текущем процессе')
+    return parser.parse_args()
+
+
+def seed(posts):
+    from django.contrib.auth import get_user_model
+
+    from posts.models import Post
+
+    User = get_user_model()
+    author = User.objects.create_user(username='author')
+    Post.objects.bulk_create(
+        Post(text=f'Пост {i}', author=author) for i in range(posts))
+    return author
+
+
+def worker(make_request, deadline, result):
+    from django.db import OperationalError, connection
+
+    done = errors = 0
+    while time.monotonic() < deadline:
+        try:
+            make_request()
+            done += 1
+        except OperationalError:
+            errors += 1
+    connection.close()
+    result.append((done, errors))
+
+
+def run_profile(options):
+    from django.db import connection
+    from django.test import Client
+
+    with tempfile.TemporaryDirectory() as tmp:
+        setup_django(os.path.join(tmp, 'bench.sqlite3'))
+        author = seed(options.posts)
+        connection.close()
+        deadline = time.monotonic() + options.seconds
+        writes, reads, threads = [], [], []
+        for number in range(options.writers + options.readers):
+            client = Client()
+            if number < options.writers:
+                client.force_login(author)
+                request = (lambda client=client: client.post(
+                    '/create/', {'text': 'Новый пост'}))
+                result = writes
+            else:
+                request = (lambda client=client: client.get('/'))
+                result = reads
+            threads.append(threading.Thread(
+                target=worker, args=(request, deadline, result)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return {
+        'writes_per_s': sum(done for done, _ in writes) / options.seconds,
+        'reads_per_s': sum(done for done, _ in reads) / options.seconds,
+        'write_errors': sum(errors for _, errors in writes),
+        'read_errors': sum(errors for _, errors in reads),
+    }
+
+
+def main():
+    options = parse_args()
+    if options.profile:
+        print(json.dumps(run_profile(options)))
+        return
+    print(f'{"профиль":>11} {"запись/с":>9} {"чтение/с":>9} '
+          f'{"ошибок записи":>14} {"ошибок чтения":>14}')
+    for profile in PROFILES:
+        output = subprocess.check_output(
+            [sys.executable, __file__, '--profile', profile,
+             '--posts', str(options.posts),
+             '--writers', str(options.writers),
+             '--readers', str(options.readers),
+             '--seconds', str(options.seconds)],
+            env={**os.environ, 'YATUBE_DB_PROFILE': profile}, text=True)
+        result = json.loads(output.splitlines()[-1])
+        print(f'{profile:>11} {result["writes_per_s"]:>9.1f} '
+              f'{result["reads_per_s"]:>9.1f} '
+              f'{result["write_errors"]:>14} {result["read_errors"]:>14}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Рендер posts/index.html с загрузчиками по умолчанию и с кеширующим.
+
+Без кеширующего загрузчика каждый рендер заново читает и разбирает
+base.html, шапку, подвал и шаблоны ленты. Холодный рендер кеширующего
+загрузчика — первый после сброса кеша, тёплый — все следующие:
+
+    python benchmarks/bench_templates.py [постов на странице]
+"""
+import sys
+
+from common import measure, setup_django
+
+LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+
+
+def make_backend(loaders):
+    from django.conf import settings
+    from django.template.backends.django import DjangoTemplates
+
+    params = dict(settings.TEMPLATES[0], NAME='bench', APP_DIRS=False)
+    del params['BACKEND']
+    params['OPTIONS'] = dict(params['OPTIONS'], loaders=loaders,
+                             debug=False)
+    return DjangoTemplates(params)
+
+
+def main(per_page):
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test import RequestFactory
+
+    from posts.models import Group, Post
+    from posts.utils import paginate
+
+    author = get_user_model().objects.create(
+        username='bench', first_name='Имя', last_name='Фамилия')
+    group = Group.objects.create(title='группа', slug='bench')
+    Post.objects.bulk_create(
+        Post(text=f'Пост {i} ' * 20, author=author, group=group)
+        for i in range(per_page)
+    )
+    request = RequestFactory().get('/')
+    request.user = author
+    context = {
+        'page_obj': paginate(request, Post.objects.compact(), per_page),
+        'text': 'Последние обновления на сайте',
+    }
+
+    def render(backend):
+        backend.get_template('posts/index.html').render(context, request)
+
+    plain = make_backend(LOADERS)
+    cached = make_backend([('django.template.loaders.cached.Loader',
+                            LOADERS)])
+    # Первый рендер прогревает фрагментный кеш карточек: дальше
+    # замеряются только загрузка и рендер самих шаблонов.
+    render(plain)
+
+    def render_cold():
+        cached.engine.template_loaders[0].reset()
+        render(cached)
+
+    print(f'default loaders: {measure(lambda: render(plain)):.2f} ms')
+    print(f'cached, cold:    {measure(render_cold):.2f} ms')
+    render(cached)
+    print(f'cached, warm:    {measure(lambda: render(cached)):.2f} ms')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,44 @@
+"""Общая обвязка для бенчмарков: Django-окружение и замеры времени.
+
+Бенчмарки запускаются из корня репозитория:
+
+    python benchmarks/bench_pagination.py
+
+и работают на отдельной тестовой базе, рабочую базу они не трогают.
+"""
+import os
+import statistics
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT_DIR = os.path.join(BASE_DIR, 'yatube')
+
+
+def setup_django(test_db_name=None):
+    """Поднимает Django на тестовой базе.
+
+    По умолчанию SQLite создаёт базу в памяти; test_db_name задаёт файл,
+    нужный, когда к базе обращаются несколько потоков сервера.
+    """
+    sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    if test_db_name:
+        settings.DATABASES['default']['TEST'] = {'NAME': test_db_name}
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+
+def measure(func, repeat=20):
+    """Возвращает медиану времени вызова func в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
@@ -0,0 +1,187 @@
+"""Нагрузочный прогон всех страниц posts, users и about.
+
+Наполняет отдельную тестовую базу данными Faker и прогоняет каждый
+маршрут GET-запросами через тестовый клиент Django от имени автора.
+Результат — JSON с пропускной способностью, квантилями задержки
+и количеством SQL-запросов, который удобно сравнивать между коммитами:
+
+    python benchmarks/run.py --posts 1000000 --users 10000 --groups 500 \\
+        --output bench_output.json
+"""
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from common import BASE_DIR, setup_django
+
+PASSWORD = 'bench-password'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--posts', type=int, default=100000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--groups', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=50,
+                        help='Запросов на каждый маршрут')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='-')
+    return parser.parse_args()
+
+
+def seed(options):
+    from django.contrib.auth import get_user_model
+    from django.core.management import call_command
+    from django.db import connection
+    from faker import Faker
+
+    from posts.models import Group, Post
+    from posts.search import rebuild_search_index
+
+    User = get_user_model()
+    fake = Faker('ru_RU')
+    Faker.seed(options.seed)
+    random.seed(options.seed)
+
+    User.objects.bulk_create(
+        User(username=f'user{i}', first_name=fake.first_name(),
+             last_name=fake.last_name())
+        for i in range(options.users)
+    )
+    Group.objects.bulk_create(
+        Group(title=fake.sentence(nb_words=3)[:200], slug=f'group{i}',
+              description=fake.paragraph())
+        for i in range(options.groups)
+    )
+    user_ids = list(User.objects.values_list('pk', flat=True))
+    group_ids = list(Group.objects.values_list('pk', flat=True)) + [None]
+    texts = [fake.paragraph(nb_sentences=5) for _ in range(1000)]
+    batch = 10000
+    for start in range(0, options.posts, batch):
+        Post.objects.bulk_create(
+            Post(text=random.choice(texts),
+                 author_id=random.choice(user_ids),
+                 group_id=random.choice(group_ids))
+            for _ in range(start, min(start + batch, options.posts))
+        )
+    call_command('reconcile_counters', stdout=sys.stderr)
+    rebuild_search_index()
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+    author = User.objects.get(username='user0')
+    author.set_password(PASSWORD)
+    author.save()
+    return author
+
+
+def sample_kwargs(author):
+    from posts.models import Group, Post
+
+    post = author.posts.first() or Post.objects.first()
+    return {
+        'slug': Group.objects.first().slug,
+        'username': author.username,
+        'post_id': post.pk,
+    }
+
+
+def routes(author):
+    """Все маршруты posts, users и about с подставленными аргументами."""
+    from django.urls import reverse
+
+    from about import urls as about_urls
+    from posts import urls as posts_urls
+    from users import urls as users_urls
+
+    kwargs = sample_kwargs(author)
+    for urls in (posts_urls, users_urls, about_urls):
+        for pattern in urls.urlpatterns:
+            names = list(pattern.pattern.converters)
+            name = f'{urls.app_name}:{pattern.name}'
+            url = reverse(name, kwargs={key: kwargs[key] for key in names})
+            yield name, url
+    yield 'posts:index?page=1000', reverse('posts:index') + '?page=1000'
+    yield 'posts:search?q', reverse('posts:search') + '?q=и'
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * len(values))) - 1)]
+
+
+def bench_route(client, url, requests):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    client.get(url)
+    timings, queries, statuses = [], [], set()
+    started = time.perf_counter()
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries.append(len(captured))
+        statuses.add(response.status_code)
+    total = time.perf_counter() - started
+    return {
+        'url': url,
+        'status': sorted(statuses),
+        'throughput_rps': round(requests / total, 2),
+        'latency_ms': {
+            'mean': round(statistics.mean(timings), 3),
+            'p50': round(percentile(timings, 0.5), 3),
+            'p95': round(percentile(timings, 0.95), 3),
+            'p99': round(percentile(timings, 0.99), 3),
+        },
+        'queries': {'mean': statistics.mean(queries), 'max': max(queries)},
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=BASE_DIR, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    options = parse_args()
+    setup_django()
+    from django.test import Client
+
+    author = seed(options)
+    client = Client()
+    client.login(username=author.username, password=PASSWORD)
+    result = {
+        'revision': git_revision(),
+        'dataset': {'posts': options.posts, 'users': options.users,
+                    'groups': options.groups},
+        'requests_per_route': options.requests,
+        'routes': {},
+    }
+    for name, url in routes(author):
+        # Выход из аккаунта разлогинил бы клиент для остальных маршрутов.
+        route_client = Client() if name == 'users:logout' else client
+        result['routes'][name] = bench_route(route_client, url,
+                                             options.requests)
+        print(f'{name}: {result["routes"][name]["latency_ms"]["p50"]} ms',
+              file=sys.stderr)
+    report = json.dumps(result, ensure_ascii=False, indent=2)
+    if options.output == '-':
+        print(report)
+    else:
+        with open(options.output, 'w', encoding='utf-8') as output:
+            output.write(report + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+from urllib.parse import urlsplit
+
+import pytest
+
+from core.budgets import get_query_budget
+
+
+@pytest.fixture
+def assert_view_budget(db):
+    """Проверяет, что страница укладывается в бюджет своей view."""
+
+    def check(client, url):
+        budget = get_query_budget(urlsplit(url).path)
+        assert budget is not None, f'У view для `{url}` не задан бюджет SQL-запросов'
+        with budget.check(url):
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response
+
+    return check
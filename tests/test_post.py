@@ -118,3 +118,27 @@ class TestPostEditView:
         assert response.url.startswith(f'/posts/{post_with_group.id}'), (
             'Проверьте, что перенаправляете на страницу поста `/posts/<post_id>/`'
         )
+
+
+class TestPostQueryBudget:
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.parametrize('url', [
+        '/',
+        '/group/{slug}/',
+        '/profile/{username}/',
+        '/posts/{post_id}/',
+        '/posts/{post_id}/edit/',
+        '/create/',
+        '/search/?q=пост',
+    ])
+    def test_post_pages_fit_query_budget(self, user_client, few_posts_with_group, assert_view_budget, url):
+        url = url.format(
+            slug=few_posts_with_group.group.slug,
+            username=few_posts_with_group.author.username,
+            post_id=few_posts_with_group.id,
+        )
+        response = assert_view_budget(user_client, url)
+        assert response.status_code == 200, (
+            f'Проверьте, что страница `{url}` доступна автору поста'
+        )
@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from .db import apply_sqlite_pragmas
+        from .metrics import instrument_templates
+        instrument_templates()
+        connection_created.connect(apply_sqlite_pragmas)
@@ -0,0 +1,60 @@
+"""Бюджеты SQL-запросов для view.
+
+Декоратор query_budget помечает view максимальным числом запросов
+и суммарным временем SQL на один запрос страницы. Бюджет считается для
+авторизованного пользователя, вместе с запросами сессии и пользователя.
+Тесты проверяют его через QueryBudget.check().
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+DEFAULT_SQL_MS = 50
+
+
+class QueryBudget:
+    def __init__(self, queries, sql_ms=DEFAULT_SQL_MS):
+        self.queries = queries
+        self.sql_ms = sql_ms
+
+    def __repr__(self):
+        return f'QueryBudget(queries={self.queries}, sql_ms={self.sql_ms})'
+
+    def problems(self, captured):
+        sql_ms = sum(float(query['time']) for query in captured) * 1000
+        problems = []
+        if len(captured) > self.queries:
+            problems.append(
+                f'{len(captured)} SQL-запросов при бюджете {self.queries}')
+        if self.sql_ms is not None and sql_ms > self.sql_ms:
+            problems.append(
+                f'{sql_ms:.1f} мс SQL при бюджете {self.sql_ms} мс')
+        return problems
+
+    @contextmanager
+    def check(self, label='', using=DEFAULT_DB_ALIAS):
+        """Падает с AssertionError и списком SQL, если бюджет превышен."""
+        with CaptureQueriesContext(connections[using]) as captured:
+            yield captured
+        problems = self.problems(captured.captured_queries)
+        if problems:
+            queries = '\n'.join(
+                f'{number}. {query["sql"]}'
+                for number, query in enumerate(captured.captured_queries, 1)
+            )
+            raise AssertionError(
+                f'{label}: {"; ".join(problems)}\n{queries}')
+
+
+def query_budget(queries, sql_ms=DEFAULT_SQL_MS):
+    def decorator(view):
+        view.query_budget = QueryBudget(queries, sql_ms)
+        return view
+    return decorator
+
+
+def get_query_budget(path):
+    """Бюджет view, которая обслуживает путь, или None."""
+    return getattr(resolve(path).func, 'query_budget', None)
@@ -0,0 +1,39 @@
+"""Окружение Jinja2 для шаблонов из jinja2/.
+
+Даёт шаблонам то же, что они берут у Django: static, url, фильтры
+user_filters, page_window и фильтр date в местном времени.
+"""
+from functools import lru_cache
+
+from django.template.defaultfilters import date as date_format
+from django.templatetags.static import static
+from django.urls import get_script_prefix, get_urlconf, reverse
+from django.utils.timezone import template_localtime
+from jinja2 import Environment
+
+from .templatetags.pagination import page_window
+from .templatetags.user_filters import register as user_filters
+
+
+@lru_cache(maxsize=4096)
+def cached_reverse(name, args, prefix, urlconf):
+    return reverse(name, urlconf, args)
+
+
+def url(name, *args):
+    # reverse() — самое дорогое в карточке ленты, а ссылки на авторов,
+    # группы и свежие посты повторяются из запроса в запрос. Префикс
+    # и urlconf входят в ключ, как и в самом reverse().
+    return cached_reverse(name, args, get_script_prefix(), get_urlconf())
+
+
+def date(value, arg=None):
+    return date_format(template_localtime(value), arg)
+
+
+def environment(**options):
+    env = Environment(**options)
+    env.globals.update(static=static, url=url, page_window=page_window)
+    env.filters.update(user_filters.filters)
+    env.filters['date'] = date
+    return env
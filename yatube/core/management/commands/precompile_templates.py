@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.warmup import precompile_templates
+
+
+class Command(BaseCommand):
+    help = 'Разбирает все шаблоны и сообщает об ошибках в них'
+
+    def handle(self, *args, **options):
+        compiled, errors = precompile_templates()
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        self.stdout.write(f'Разобрано шаблонов: {compiled}')
+        if errors:
+            raise CommandError(f'Шаблонов с ошибками: {len(errors)}')
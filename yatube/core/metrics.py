@@ -0,0 +1,129 @@
+"""Сбор времени ответа, SQL и рендера шаблонов по view.
+
+Значения хранятся в памяти процесса: по каждой метрике и view — выборка
+из последних METRICS_RESERVOIR_SIZE наблюдений, по которой считаются
+квантили, и накопительные count/sum для Prometheus.
+"""
+import threading
+import time
+from collections import defaultdict, deque
+
+from django.conf import settings
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+METRICS = {
+    'view_seconds': 'Время обработки запроса',
+    'sql_queries': 'Количество SQL-запросов на запрос',
+    'sql_seconds': 'Суммарное время SQL-запросов',
+    'template_seconds': 'Время рендера шаблонов',
+}
+
+_local = threading.local()
+
+
+class RequestStats:
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_seconds = 0.0
+        self.template_seconds = 0.0
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_seconds += time.perf_counter() - start
+            self.sql_queries += 1
+
+
+def current_stats():
+    return getattr(_local, 'stats', None)
+
+
+def set_current_stats(stats):
+    _local.stats = stats
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(self._new_reservoir)
+        self._totals = defaultdict(lambda: [0, 0.0])
+
+    def _new_reservoir(self):
+        return deque(maxlen=settings.METRICS_RESERVOIR_SIZE)
+
+    def observe(self, metric, view_name, value):
+        with self._lock:
+            self._samples[metric, view_name].append(value)
+            total = self._totals[metric, view_name]
+            total[0] += 1
+            total[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: (sorted(samples), *self._totals[key])
+                for key, samples in self._samples.items()
+            }
+
+
+registry = MetricsRegistry()
+
+
+def quantile(values, q):
+    """Квантиль по методу ближайшего ранга для отсортированной выборки."""
+    index = max(0, min(len(values) - 1, int(round(q * len(values))) - 1))
+    return values[index]
+
+
+def escape_label(value):
+    return (value.replace('\\', r'\\').replace('"', r'\"')
+            .replace('\n', r'\n'))
+
+
+def render_prometheus(snapshot):
+    lines = []
+    for metric, help_text in METRICS.items():
+        name = f'yatube_{metric}'
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} summary')
+        for (key_metric, view_name), (values, count, total) in sorted(
+                snapshot.items()):
+            if key_metric != metric:
+                continue
+            label = f'view="{escape_label(view_name)}"'
+            for q in QUANTILES:
+                lines.append(f'{name}{{{label},quantile="{q}"}} '
+                             f'{quantile(values, q):.6g}')
+            lines.append(f'{name}_sum{{{label}}} {total:.6g}')
+            lines.append(f'{name}_count{{{label}}} {count}')
+    return '\n'.join(lines) + '\n'
+
+
+def instrument_templates():
+    """Оборачивает рендер шаблонов Django замером времени.
+
+    Вне замеряемого запроса обёртка только проверяет thread-local.
+    """
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        stats = current_stats()
+        if stats is None:
+            return original_render(self, context, request)
+        start = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            stats.template_seconds += time.perf_counter() - start
+
+    Template.render = render
@@ -0,0 +1,77 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import RequestStats, registry, set_current_stats
+from .routers import set_read_alias
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class MetricsMiddleware:
+    """Замеряет часть запросов: время view, SQL и рендер шаблонов.
+
+    Доля замеряемых запросов задаётся settings.METRICS_SAMPLE_RATE,
+    остальные проходят без накладных расходов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        stats = RequestStats()
+        set_current_stats(stats)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(stats.sql_wrapper))
+                response = self.get_response(request)
+        finally:
+            set_current_stats(None)
+        elapsed = time.perf_counter() - start
+        match = request.resolver_match
+        view_name = match.view_name if match else 'unresolved'
+        registry.observe('view_seconds', view_name, elapsed)
+        registry.observe('sql_queries', view_name, stats.sql_queries)
+        registry.observe('sql_seconds', view_name, stats.sql_seconds)
+        registry.observe('template_seconds', view_name,
+                         stats.template_seconds)
+        return response
+
+
+class ReplicaMiddleware:
+    """Читает из реплики на страницах settings.REPLICA_READ_VIEWS.
+
+    После запроса с записью пользователь получает cookie, и следующие
+    settings.REPLICA_PIN_SECONDS секунд его запросы читают из default:
+    так он сразу видит свой пост, даже если реплика отстаёт.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        finally:
+            set_read_alias(None)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(settings.REPLICA_PIN_COOKIE, '1',
+                                max_age=settings.REPLICA_PIN_SECONDS,
+                                httponly=True)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (settings.REPLICA_DATABASES
+                and request.method in SAFE_METHODS
+                and request.resolver_match.view_name
+                in settings.REPLICA_READ_VIEWS
+                and settings.REPLICA_PIN_COOKIE not in request.COOKIES):
+            set_read_alias(random.choice(settings.REPLICA_DATABASES))
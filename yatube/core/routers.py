@@ -0,0 +1,42 @@
+"""Маршрутизация чтения на реплики.
+
+ReplicaMiddleware отмечает запросы к view только для чтения, и на время
+такого запроса ReplicaRouter отправляет чтение на одну из реплик из
+settings.REPLICA_DATABASES. Запись и остальные запросы идут в default.
+"""
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_state = threading.local()
+
+
+def get_read_alias():
+    return getattr(_state, 'alias', None)
+
+
+def set_read_alias(alias):
+    _state.alias = alias
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return get_read_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Без явного ответа Django пишет в базу, из которой прочитан
+        # объект, то есть в реплику.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.REPLICA_DATABASES}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Схему на реплики переносит репликация.
+        if db in settings.REPLICA_DATABASES:
+            return False
+        return None
@@ -0,0 +1,31 @@
+from django import template
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj, on_each_side=2, on_ends=1):
+    """Номера страниц для пагинатора: края и окно вокруг текущей.
+
+    Пропуск между ними обозначается None. У страниц без номера
+    (по курсору) список пустой: для них выводятся только ссылки
+    «Предыдущая» и «Следующая».
+    """
+    number = page_obj.number
+    if number is None:
+        return []
+    num_pages = page_obj.paginator.num_pages
+    if num_pages <= (on_each_side + on_ends) * 2 + 1:
+        return list(range(1, num_pages + 1))
+    pages = []
+    if number > on_each_side + on_ends + 1:
+        pages += [*range(1, on_ends + 1), None]
+        start = number - on_each_side
+    else:
+        start = 1
+    if number < num_pages - on_each_side - on_ends:
+        end = number + on_each_side
+        tail = [None, *range(num_pages - on_ends + 1, num_pages + 1)]
+    else:
+        end = num_pages
+        tail = []
+    return pages + list(range(start, end + 1)) + tail
@@ -0,0 +1,25 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from core.db import apply_sqlite_pragmas
+
+
+class SQLitePragmaTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    @override_settings(SQLITE_PRAGMAS={'cache_size': -4096,
+                                       'busy_timeout': 3000})
+    def test_pragmas_applied_to_new_connection(self):
+        """Хук connection_created выполняет PRAGMA из настроек."""
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        self.assertEqual(self.pragma('cache_size'), -4096)
+        self.assertEqual(self.pragma('busy_timeout'), 3000)
+
+    @override_settings(SQLITE_PRAGMAS={})
+    def test_default_profile_keeps_sqlite_defaults(self):
+        before = self.pragma('cache_size')
+        apply_sqlite_pragmas(sender=None, connection=connection)
+        self.assertEqual(self.pragma('cache_size'), before)
@@ -0,0 +1,44 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+
+from core.metrics import quantile, registry
+
+User = get_user_model()
+
+
+@override_settings(METRICS_SAMPLE_RATE=1)
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create(username='staff', is_staff=True)
+
+    def setUp(self):
+        registry.clear()
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def test_metrics_page_in_prometheus_format(self):
+        self.staff_client.get('/')
+        response = self.staff_client.get('/metrics')
+        content = response.content.decode()
+        self.assertIn('# TYPE yatube_view_seconds summary', content)
+        self.assertIn('yatube_sql_queries_count{view="posts:index"} 1',
+                      content)
+        self.assertIn('yatube_template_seconds{view="posts:index",'
+                      'quantile="0.99"}', content)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_unsampled_requests_not_recorded(self):
+        self.staff_client.get('/')
+        self.assertEqual(registry.snapshot(), {})
+
+    def test_metrics_only_for_staff(self):
+        response = Client().get('/metrics')
+        self.assertEqual(response.status_code, 302)
+
+    def test_quantile(self):
+        values = list(range(1, 101))
+        self.assertEqual(quantile(values, 0.5), 50)
+        self.assertEqual(quantile(values, 0.99), 99)
+        self.assertEqual(quantile([7], 0.95), 7)
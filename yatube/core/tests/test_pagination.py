@@ -0,0 +1,40 @@
+from django.core.paginator import Paginator
+from django.template import Context, Template
+from django.test import SimpleTestCase
+
+from core.templatetags.pagination import page_window
+
+
+class PageWindowTests(SimpleTestCase):
+    def window(self, count, number):
+        return page_window(Paginator(range(count), 1).page(number))
+
+    def test_short_range_not_elided(self):
+        self.assertEqual(self.window(5, 3), [1, 2, 3, 4, 5])
+
+    def test_window_around_current_page(self):
+        """Выводятся края и соседи текущей страницы, между ними пропуск."""
+        self.assertEqual(self.window(5000, 1), [1, 2, 3, None, 5000])
+        self.assertEqual(self.window(5000, 2500),
+                         [1, None, 2498, 2499, 2500, 2501, 2502, None, 5000])
+        self.assertEqual(self.window(5000, 4999),
+                         [1, None, 4997, 4998, 4999, 5000])
+
+    def test_window_size_does_not_depend_on_page_count(self):
+        for count in (100, 10 ** 4, 10 ** 6):
+            with self.subTest(count=count):
+                self.assertLessEqual(len(self.window(count, count // 2)), 9)
+
+    def test_count_free_page_has_no_numbers(self):
+        page = Paginator([], 1).page(1)
+        page.number = None
+        self.assertEqual(page_window(page), [])
+
+    def test_tag_in_template(self):
+        template = Template(
+            '{% load pagination %}{% page_window page_obj as pages %}'
+            '{% for i in pages %}{{ i|default:"…" }} {% endfor %}'
+        )
+        page = Paginator(range(100), 1).page(50)
+        self.assertEqual(template.render(Context({'page_obj': page})),
+                         '1 … 48 49 50 51 52 … 100 ')
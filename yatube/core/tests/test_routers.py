@@ -0,0 +1,125 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.http import HttpResponse
+from django.test import (Client, RequestFactory, SimpleTestCase,
+                         TransactionTestCase, override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+
+from core.middleware import ReplicaMiddleware
+from core.routers import ReplicaRouter, set_read_alias
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaRoutingTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def route(self, method, path, cookies=None):
+        """База чтения внутри view и ответ middleware."""
+        request = getattr(self.factory, method)(path)
+        request.COOKIES.update(cookies or {})
+        request.resolver_match = resolve(path)
+        seen = []
+
+        def get_response(request):
+            middleware.process_view(request, None, (), {})
+            seen.append(self.router.db_for_read(Post))
+            return HttpResponse()
+
+        middleware = ReplicaMiddleware(get_response)
+        response = middleware(request)
+        return seen[0], response
+
+    def test_read_only_views_read_from_replica(self):
+        for name in settings.REPLICA_READ_VIEWS:
+            if name.startswith('about'):
+                path = reverse(name)
+            else:
+                path = {
+                    'posts:index': '/',
+                    'posts:group_index': '/groups/',
+                    'posts:group_list': '/group/slug/',
+                    'posts:profile': '/profile/user/',
+                    'posts:post_detail': '/posts/1/',
+                    'posts:index_fragment': '/fragment/',
+                    'posts:group_fragment': '/group/slug/fragment/',
+                }[name]
+            with self.subTest(name=name):
+                alias, _ = self.route('get', path)
+                self.assertEqual(alias, 'replica')
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    def test_other_views_read_from_primary(self):
+        for path in ('/create/', '/posts/1/edit/', '/auth/login/',
+                     '/auth/signup/'):
+            with self.subTest(path=path):
+                alias, _ = self.route('get', path)
+                self.assertEqual(alias, 'default')
+
+    def test_write_pins_user_to_primary(self):
+        alias, response = self.route('post', '/create/')
+        self.assertEqual(alias, 'default')
+        cookie = response.cookies[settings.REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_PIN_SECONDS)
+        alias, _ = self.route('get', '/', {settings.REPLICA_PIN_COOKIE: '1'})
+        self.assertEqual(alias, 'default')
+
+    @override_settings(REPLICA_DATABASES=[])
+    def test_without_replicas_everything_reads_primary(self):
+        alias, _ = self.route('get', '/')
+        self.assertEqual(alias, 'default')
+
+    def test_writes_always_go_to_primary(self):
+        set_read_alias('replica')
+        try:
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+        finally:
+            set_read_alias(None)
+
+
+@override_settings(REPLICA_DATABASES=['replica'])
+class ReplicaReadTests(TransactionTestCase):
+    """Чтение через настоящее соединение реплики.
+
+    Под тестами реплика — зеркало default, поэтому данные пишутся
+    с коммитом: открытую транзакцию TestCase соединение реплики
+    не увидит.
+    """
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.user = User.objects.create(username='author')
+        Post.objects.create(text='Пост из реплики', author=self.user)
+
+    def queries(self, path, client=None):
+        client = client or Client()
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response, [query['sql'] for query in primary], \
+            [query['sql'] for query in replica]
+
+    @staticmethod
+    def reads_posts(queries):
+        return any('"posts_post"' in sql for sql in queries)
+
+    def test_feed_reads_posts_from_replica(self):
+        response, primary, replica = self.queries('/')
+        self.assertContains(response, 'Пост из реплики')
+        self.assertTrue(self.reads_posts(replica))
+        self.assertFalse(self.reads_posts(primary))
+
+    def test_pinned_user_reads_from_primary(self):
+        client = Client()
+        client.cookies[settings.REPLICA_PIN_COOKIE] = '1'
+        response, primary, replica = self.queries('/', client)
+        self.assertContains(response, 'Пост из реплики')
+        self.assertTrue(self.reads_posts(primary))
+        self.assertEqual(replica, [])
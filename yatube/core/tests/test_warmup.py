@@ -0,0 +1,58 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test import TestCase, override_settings
+
+from core.warmup import precompile_or_fail
+
+CACHED_TEMPLATES = [{
+    **settings.TEMPLATES[0],
+    'APP_DIRS': False,
+    'OPTIONS': {
+        **settings.TEMPLATES[0]['OPTIONS'],
+        'loaders': [
+            ('django.template.loaders.cached.Loader', [
+                'django.template.loaders.filesystem.Loader',
+                'django.template.loaders.app_directories.Loader',
+            ]),
+        ],
+    },
+}]
+
+
+@override_settings(TEMPLATES=CACHED_TEMPLATES)
+class PrecompileTemplatesTests(TestCase):
+    def cached_names(self):
+        loader = engines['django'].engine.template_loaders[0]
+        return set(loader.get_template_cache)
+
+    def test_command_fills_cached_loader(self):
+        """Команда разбирает шаблоны проекта и приложений заранее."""
+        out = StringIO()
+        call_command('precompile_templates', stdout=out)
+        cached = self.cached_names()
+        for name in ('base.html', 'includes/header.html', 'posts/index.html',
+                     'posts/includes/post_card.html', 'admin/base.html'):
+            with self.subTest(name=name):
+                self.assertIn(name, cached)
+        self.assertIn(f'Разобрано шаблонов: {len(cached)}', out.getvalue())
+
+    def test_broken_template_fails_startup(self):
+        """Ошибку шаблона видно при запуске, а не на первом запросе."""
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'broken.html'), 'w') as file:
+                file.write('{% if %}')
+            templates = [{**CACHED_TEMPLATES[0],
+                          'DIRS': [directory, *CACHED_TEMPLATES[0]['DIRS']]}]
+            with override_settings(TEMPLATES=templates):
+                with self.assertRaisesMessage(ImproperlyConfigured,
+                                              'broken.html'):
+                    precompile_or_fail()
+                with self.assertRaises(CommandError):
+                    call_command('precompile_templates', stdout=StringIO(),
+                                 stderr=StringIO())
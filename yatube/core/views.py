@@ -0,0 +1,10 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+
+from .metrics import registry, render_prometheus
+
+
+@staff_member_required
+def metrics(request):
+    return HttpResponse(render_prometheus(registry.snapshot()),
+                        content_type='text/plain; version=0.0.4')
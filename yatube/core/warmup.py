@@ -0,0 +1,60 @@
+"""Разбор всех шаблонов заранее, чтобы их не компилировал первый запрос."""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+from django.template import TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_EXTENSIONS = ('.html', '.txt', '.xml')
+
+
+def template_names(backend):
+    """Имена шаблонов из каталогов всех загрузчиков движка."""
+    if not isinstance(backend, DjangoTemplates):
+        # Jinja2: окружение само перечисляет шаблоны своего загрузчика.
+        return backend.env.list_templates(
+            filter_func=lambda name: name.endswith(TEMPLATE_EXTENSIONS))
+    names = set()
+    for loader in backend.engine.template_loaders:
+        # Кеширующий загрузчик сам каталогов не знает — их знают вложенные.
+        for inner in getattr(loader, 'loaders', [loader]):
+            for directory in getattr(inner, 'get_dirs', list)():
+                for root, _, files in os.walk(directory):
+                    for name in files:
+                        if name.endswith(TEMPLATE_EXTENSIONS):
+                            path = os.path.join(root, name)
+                            names.add(os.path.relpath(path, directory)
+                                      .replace(os.sep, '/'))
+    return sorted(names)
+
+
+def precompile_templates():
+    """Загружает каждый шаблон всех движков из TEMPLATES.
+
+    С кеширующим загрузчиком Django и кешем окружения Jinja2 разобранные
+    шаблоны остаются в памяти процесса. Возвращает число шаблонов
+    и словарь имя -> ошибка.
+    """
+    compiled, errors = 0, {}
+    for backend in engines.all():
+        for name in template_names(backend):
+            try:
+                backend.get_template(name)
+            except TemplateSyntaxError as error:
+                errors[name] = str(error)
+            else:
+                compiled += 1
+    return compiled, errors
+
+
+def precompile_or_fail():
+    """precompile_templates() при старте процесса.
+
+    Сломанный шаблон роняет запуск, а не первый запрос, который его
+    отрисует.
+    """
+    compiled, errors = precompile_templates()
+    if errors:
+        raise ImproperlyConfigured('Шаблоны с ошибками: ' + '; '.join(
+            f'{name}: {error}' for name, error in errors.items()))
+    return compiled
@@ -1,5 +1,88 @@
 from django.contrib import admin
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.forms import HiddenInput
+from django.forms.models import BaseModelFormSet
+from django.utils.html import format_html, format_html_join
 from .models import Post, Group
+from .paginators import AdminEstimatedCountPaginator
+from .search import match_posts
+
+
+def attrs_html(attrs):
+    """Атрибуты тега так же, как их пишет django/forms/widgets/attrs.html."""
+    return format_html_join('', ' {}{}', (
+        (name, '' if value is True else format_html('="{}"', value))
+        for name, value in attrs.items() if value is not False
+    ))
+
+
+class LoadedAutocompleteSelect(AutocompleteSelect):
+    """Автодополнение, которому выбранный объект передан заранее.
+
+    Обычный виджет ищет подпись выбранной группы отдельным запросом,
+    то есть по запросу на каждую строку changelist.
+    """
+
+    loaded = None
+
+    def is_loaded(self, value):
+        return self.loaded is not None and list(value) == [
+            str(self.loaded.pk)]
+
+    def render(self, name, value, attrs=None, renderer=None):
+        if not self.is_loaded(self.format_value(value)):
+            return super().render(name, value, attrs, renderer)
+        context = self.get_context(name, value, attrs)['widget']
+        # Шаблоны select и option на каждую из 50 строк — самая дорогая
+        # часть changelist. Разметка та же, что у шаблонов Django.
+        options = format_html_join(
+            '', '\n  <option value="{}"{}>{}</option>', (
+                (option['value'], attrs_html(option['attrs']),
+                 option['label'])
+                for _, group, _ in context['optgroups'] for option in group
+            ))
+        return format_html('<select name="{}"{}>{}\n</select>',
+                           context['name'], attrs_html(context['attrs']),
+                           options)
+
+    def optgroups(self, name, value, attr=None):
+        if not self.is_loaded(value):
+            return super().optgroups(name, value, attr)
+        options = []
+        if not self.is_required:
+            options.append(self.create_option(name, '', '', False, 0))
+        options.append(self.create_option(
+            name, self.loaded.pk, self.choices.field.label_from_instance(
+                self.loaded), True, len(options)))
+        return [(None, options, 0)]
+
+
+class PlainHiddenInput(HiddenInput):
+    """Скрытое поле без шаблона input.html, с той же разметкой."""
+
+    def render(self, name, value, attrs=None, renderer=None):
+        context = self.get_context(name, value, attrs)['widget']
+        value = context['value']
+        return format_html(
+            '<input type="{}" name="{}"{}{}>', context['type'],
+            context['name'],
+            '' if value is None else format_html(' value="{}"', value),
+            attrs_html(context['attrs']))
+
+
+class PostChangeListFormSet(BaseModelFormSet):
+    def _construct_form(self, i, **kwargs):
+        form = super()._construct_form(i, **kwargs)
+        # В строке changelist ссылки «добавить/изменить группу» не нужны,
+        # а их обёртка — ещё один шаблон и три reverse() на строку.
+        group = form.fields['group']
+        group.widget = group.widget.widget
+        # Группа уже загружена через list_select_related.
+        group.widget.loaded = form.instance.group
+        pk = form.fields[Post._meta.pk.name]
+        pk.widget = PlainHiddenInput(pk.widget.attrs)
+        return form
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -8,7 +91,47 @@ class PostAdmin(admin.ModelAdmin):
     search_fields = ('text',)
     list_filter = ('pub_date',)
     empty_value_display = '-пусто-'
+    # Режим для больших таблиц: автор и группа в том же запросе, вместо
+    # списка всех групп в каждой строке — автодополнение, автор — по id,
+    # без точного COUNT(*) и с поиском по полнотекстовому индексу.
+    list_select_related = ('author', 'group')
+    autocomplete_fields = ('group',)
+    raw_id_fields = ('author',)
+    paginator = AdminEstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    def action_checkbox(self, obj):
+        # Та же разметка, что у helpers.checkbox, но без шаблона на строку.
+        return format_html(
+            '<input type="checkbox" name="{}" value="{}" '
+            'class="action-select">', ACTION_CHECKBOX_NAME, obj.pk)
+    action_checkbox.short_description = (
+        admin.ModelAdmin.action_checkbox.short_description)
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == 'group':
+            kwargs['widget'] = LoadedAutocompleteSelect(
+                db_field.remote_field, self.admin_site,
+                using=kwargs.get('using'))
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_changelist_formset(self, request, **kwargs):
+        return super().get_changelist_formset(
+            request, formset=PostChangeListFormSet, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        return match_posts(queryset, search_term), False
+
+
+class GroupAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'title', 'slug', 'posts_count')
+    search_fields = ('title', 'slug')
+    ordering = ('title',)
+    prepopulated_fields = {'slug': ('title',)}
 
 
 admin.site.register(Post, PostAdmin)
-admin.site.register(Group)
+admin.site.register(Group, GroupAdmin)
@@ -0,0 +1,193 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+
+
+class LocalLRUCache:
+    """Небольшой кеш в памяти процесса с вытеснением давних записей."""
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout, max_size):
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class TieredPageCache:
+    """Локальный LRU перед общим кешем Django.
+
+    Ключ страницы включает версии её областей (лента, группа, автор).
+    Версии хранятся только в общем кеше, поэтому сброс области сразу
+    виден всем процессам, а устаревшие записи локального уровня просто
+    перестают запрашиваться.
+    """
+
+    def __init__(self):
+        self.local = LocalLRUCache()
+
+    @property
+    def shared(self):
+        return caches[settings.POSTS_PAGE_CACHE_ALIAS]
+
+    @property
+    def spans_processes(self):
+        """Видят ли все процессы одни и те же версии и отметки сброса.
+
+        У LocMemCache и DummyCache в каждом процессе своя копия.
+        """
+        return not isinstance(self.shared, (LocMemCache, DummyCache))
+
+    def versions(self, scopes):
+        keys = [f'posts:scope:{scope}' for scope in scopes]
+        versions = self.shared.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # Версия начинается со времени, чтобы после вытеснения
+                # из общего кеша не вернуться к уже выданному значению.
+                self.shared.add(key, time.time_ns(), None)
+                versions[key] = self.shared.get(key)
+        return [versions[key] for key in keys]
+
+    def bump(self, scopes):
+        for scope in scopes:
+            key = f'posts:scope:{scope}'
+            try:
+                self.shared.incr(key)
+            except ValueError:
+                self.shared.set(key, time.time_ns(), None)
+        now = time.time()
+        self.shared.set_many(
+            {f'posts:changed:{scope}': now for scope in scopes}, None)
+
+    def changed_at(self, scopes):
+        """Время последнего сброса областей.
+
+        В отличие от дат видимых постов, оно растёт и при удалениях.
+        Если отметки нет (холодный кеш), областью считается изменённой
+        сейчас: лишний 200 лучше ошибочного 304.
+        """
+        keys = [f'posts:changed:{scope}' for scope in scopes]
+        stamps = self.shared.get_many(keys)
+        if len(stamps) < len(keys):
+            now = time.time()
+            self.shared.set_many({key: now for key in keys
+                                  if key not in stamps}, None)
+            stamps = self.shared.get_many(keys)
+        return datetime.fromtimestamp(max(stamps.values()), timezone.utc)
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.local.set(key, value, settings.POSTS_PAGE_CACHE_TIMEOUT,
+                               settings.POSTS_PAGE_CACHE_LOCAL_SIZE)
+        return value
+
+    def set(self, key, value):
+        timeout = settings.POSTS_PAGE_CACHE_TIMEOUT
+        self.shared.set(key, value, timeout)
+        self.local.set(key, value, timeout,
+                       settings.POSTS_PAGE_CACHE_LOCAL_SIZE)
+
+
+page_cache = TieredPageCache()
+
+
+def page_key(view_name, scopes, request):
+    versions = page_cache.versions(scopes)
+    raw = '|'.join([view_name, *scopes, *map(str, versions),
+                    request.GET.urlencode()])
+    return 'posts:page:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def cached_response(request, content, content_type, etag, last_modified):
+    response = get_conditional_response(
+        request, etag=etag,
+        last_modified=last_modified and parse_http_date_safe(last_modified)
+    )
+    if response is None:
+        response = HttpResponse(content, content_type=content_type)
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = last_modified
+    return response
+
+
+def cache_feed(view_name, get_scopes):
+    """Кеширует страницу ленты для анонимных GET-запросов.
+
+    get_scopes получает именованные аргументы view и возвращает
+    области, при сбросе которых страницу нужно перестроить. Кеш
+    включается для каждой view отдельно в settings.POSTS_PAGE_CACHE.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if (not settings.POSTS_PAGE_CACHE.get(view_name)
+                    or request.method != 'GET'
+                    or request.user.is_authenticated):
+                return view(request, *args, **kwargs)
+            key = page_key(view_name, get_scopes(**kwargs), request)
+            cached = page_cache.get(key)
+            if cached is not None:
+                return cached_response(request, *cached)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.streaming:
+                page_cache.set(key, (
+                    response.content, response['Content-Type'],
+                    response.get('ETag'), response.get('Last-Modified'),
+                ))
+            return response
+        return wrapper
+    return decorator
+
+
+def index_scopes():
+    return ['index']
+
+
+def group_scopes(slug):
+    return [f'group:{slug}']
+
+
+def author_scopes(username):
+    return [f'author:{username}']
+
+
+def group_index_scopes():
+    return ['groups']
@@ -0,0 +1,140 @@
+import hashlib
+import json
+from xml.sax.saxutils import escape
+
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.http import http_date
+from django.views.decorators.http import condition
+
+from core.budgets import query_budget
+from .cache import author_scopes, group_scopes, index_scopes
+from .models import Group, Post, User
+from .utils import scoped_last_modified
+
+FEED_SIZE = 50
+
+
+class PostsFeed:
+    """Посты ленты и её заголовок: общей, группы или автора."""
+
+    def __init__(self, slug=None, username=None):
+        if slug is not None:
+            group = get_object_or_404(Group, slug=slug)
+            self.title = group.title
+            self.link = reverse('posts:group_list', args=[slug])
+            self.posts = group.posts.all()
+            self.scopes = group_scopes(slug)
+        elif username is not None:
+            author = get_object_or_404(User, username=username)
+            self.title = f'Посты пользователя {author.username}'
+            self.link = reverse('posts:profile', args=[username])
+            self.posts = author.posts.all()
+            self.scopes = author_scopes(username)
+        else:
+            self.title = 'Последние обновления на сайте'
+            self.link = reverse('posts:index')
+            self.posts = Post.objects.all()
+            self.scopes = index_scopes()
+
+    @cached_property
+    def versions(self):
+        # Версия ленты — pk и время правки её постов, а также имя автора
+        # и группа, которые попадают в фид: одно короткое чтение по
+        # индексу, зато ленту меняют и правки, и удаления.
+        return list(self.posts.order_by('-pub_date', '-pk').values_list(
+            'pk', 'updated_at', 'author__username', 'author__first_name',
+            'author__last_name', 'group__slug')[:FEED_SIZE])
+
+    @property
+    def latest(self):
+        # Даты постов после удаления свежего уходят назад, время сброса
+        # областей ленты — нет.
+        return scoped_last_modified(
+            [updated for _, updated, *_ in self.versions], self.scopes)
+
+    def items(self):
+        return self.posts.compact().order_by('-pub_date', '-pk')[
+            :FEED_SIZE].iterator()
+
+
+def get_feed(request, slug=None, username=None):
+    # Ленту запрашивают и проверки условного GET, и сама view:
+    # кешируем её на запросе, чтобы не искать группу или автора дважды.
+    if not hasattr(request, 'posts_feed'):
+        request.posts_feed = PostsFeed(slug, username)
+    return request.posts_feed
+
+
+def feed_etag(request, **kwargs):
+    versions = get_feed(request, **kwargs).versions
+    raw = repr([(pk, updated.timestamp(), *rest)
+                for pk, updated, *rest in versions])
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def feed_last_modified(request, **kwargs):
+    return get_feed(request, **kwargs).latest
+
+
+def json_chunks(request, feed):
+    yield json.dumps({
+        'version': 'https://jsonfeed.org/version/1.1',
+        'title': feed.title,
+        'home_page_url': request.build_absolute_uri(feed.link),
+    }, ensure_ascii=False)[:-1] + ', "items": ['
+    for number, post in enumerate(feed.items()):
+        item = json.dumps({
+            'id': str(post.pk),
+            'url': request.build_absolute_uri(
+                reverse('posts:post_detail', args=[post.pk])),
+            'content_text': post.text,
+            'date_published': post.pub_date.isoformat(),
+            'authors': [{'name': post.author.get_full_name()
+                         or post.author.username}],
+            'tags': [post.group.slug] if post.group else [],
+        }, ensure_ascii=False)
+        yield item if number == 0 else ', ' + item
+    yield ']}'
+
+
+def rss_chunks(request, feed):
+    yield (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rss version="2.0"><channel>'
+        f'<title>{escape(feed.title)}</title>'
+        f'<link>{escape(request.build_absolute_uri(feed.link))}</link>'
+        f'<description>{escape(feed.title)}</description>'
+    )
+    for post in feed.items():
+        url = escape(request.build_absolute_uri(
+            reverse('posts:post_detail', args=[post.pk])))
+        yield (
+            '<item>'
+            f'<title>{escape(str(post))}</title>'
+            f'<link>{url}</link><guid>{url}</guid>'
+            f'<description>{escape(post.text)}</description>'
+            f'<pubDate>{http_date(post.pub_date.timestamp())}</pubDate>'
+            '</item>'
+        )
+    yield '</channel></rss>'
+
+
+@query_budget(3)
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def feed_json(request, **kwargs):
+    return StreamingHttpResponse(
+        json_chunks(request, get_feed(request, **kwargs)),
+        content_type='application/feed+json; charset=utf-8'
+    )
+
+
+@query_budget(3)
+@condition(etag_func=feed_etag, last_modified_func=feed_last_modified)
+def feed_rss(request, **kwargs):
+    return StreamingHttpResponse(
+        rss_chunks(request, get_feed(request, **kwargs)),
+        content_type='application/rss+xml; charset=utf-8'
+    )
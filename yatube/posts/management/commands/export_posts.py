@@ -0,0 +1,66 @@
+import csv
+import json
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Group, Post
+
+FIELDS = {
+    'post': ('text', 'pub_date', 'author', 'group'),
+    'group': ('title', 'slug', 'description'),
+}
+
+
+def rows(model, chunk_size):
+    if model == 'group':
+        return Group.objects.order_by('pk').values_list(
+            *FIELDS['group']).iterator(chunk_size=chunk_size)
+    posts = Post.objects.order_by('pk').values_list(
+        'text', 'pub_date', 'author__username', 'group__slug')
+    return (
+        (text, pub_date.isoformat(), author, group)
+        for text, pub_date, author, group in posts.iterator(
+            chunk_size=chunk_size)
+    )
+
+
+class Command(BaseCommand):
+    help = 'Потоковая выгрузка постов или групп в NDJSON или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=FIELDS, default='post')
+        parser.add_argument('--format', choices=('ndjson', 'csv'),
+                            default='ndjson')
+        parser.add_argument('--output', default='-',
+                            help='Файл для выгрузки, по умолчанию stdout')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        if options['output'] == '-':
+            self.export(self.stdout, options)
+        else:
+            with open(options['output'], 'w', encoding='utf-8',
+                      newline='') as output:
+                self.export(output, options)
+
+    def export(self, output, options):
+        fields = FIELDS[options['model']]
+        start = time.monotonic()
+        count = 0
+        if options['format'] == 'csv':
+            writer = csv.writer(output)
+            writer.writerow(fields)
+            write = writer.writerow
+        else:
+            def write(row):
+                output.write(json.dumps(dict(zip(fields, row)),
+                                        ensure_ascii=False) + '\n')
+        for row in rows(options['model'], options['chunk_size']):
+            write(row)
+            count += 1
+        elapsed = time.monotonic() - start
+        self.stderr.write(
+            f'Выгружено строк: {count} за {elapsed:.2f} с '
+            f'({count / max(elapsed, 1e-6):.0f} строк/с)'
+        )
@@ -0,0 +1,166 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils.dateparse import parse_datetime
+
+from posts.cache import (author_scopes, group_index_scopes, group_scopes,
+                         index_scopes, page_cache)
+from posts.models import Group, Post
+from posts.search import index_posts
+from posts.timeline import drop_timeline
+
+User = get_user_model()
+
+# Строк в одном UPDATE ... CASE: по два параметра на строку и ещё один
+# в pk__in укладываются в лимит переменных SQLite.
+PUB_DATE_CHUNK = 200
+
+
+def read_records(source, fmt):
+    if fmt == 'csv':
+        return csv.DictReader(source)
+    return (json.loads(line) for line in source if line.strip())
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def inserted_pks(posts):
+    """Первичные ключи только что вставленных bulk_create постов.
+
+    Без RETURNING (SQLite) это последние строки таблицы: вызывать
+    в той же транзакции, что и bulk_create, — запись в SQLite
+    не идёт параллельно.
+    """
+    if connection.features.can_return_ids_from_bulk_insert:
+        return [post.pk for post in posts]
+    pks = Post.objects.order_by('-pk').values_list('pk', flat=True)
+    return sorted(pks[:len(posts)])
+
+
+def restore_pub_dates(pub_dates):
+    """Ставит pub_date из выгрузки: bulk_create заполнил его auto_now_add.
+
+    update() не вызывает pre_save полей, поэтому auto_now_add дату
+    не перезапишет.
+    """
+    for chunk in batches(pub_dates.items(), PUB_DATE_CHUNK):
+        Post.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+            pub_date=Case(
+                *(When(pk=pk, then=Value(pub_date))
+                  for pk, pub_date in chunk),
+                output_field=DateTimeField(),
+            ))
+
+
+class Command(BaseCommand):
+    help = 'Потоковая загрузка постов или групп из NDJSON или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с данными, "-" для stdin')
+        parser.add_argument('--model', choices=('post', 'group'),
+                            default='post')
+        parser.add_argument('--format', choices=('ndjson', 'csv'),
+                            default='ndjson')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['path'] == '-':
+            self.load(sys.stdin, options)
+        else:
+            with open(options['path'], encoding='utf-8',
+                      newline='') as source:
+                self.load(source, options)
+
+    def load(self, source, options):
+        start = time.monotonic()
+        records = read_records(source, options['format'])
+        if options['model'] == 'group':
+            created, skipped = self.load_groups(records, options)
+        else:
+            created, skipped = self.load_posts(records, options)
+        elapsed = time.monotonic() - start
+        self.stdout.write(
+            f'Загружено строк: {created}, пропущено: {skipped} '
+            f'за {elapsed:.2f} с ({created / max(elapsed, 1e-6):.0f} строк/с)'
+        )
+
+    def load_groups(self, records, options):
+        created = skipped = 0
+        for batch in batches(records, options['batch_size']):
+            slugs = {record['slug'] for record in batch}
+            existing = set(Group.objects.filter(slug__in=slugs)
+                           .values_list('slug', flat=True))
+            groups = [
+                Group(title=record['title'], slug=record['slug'],
+                      description=record.get('description') or '')
+                for record in batch if record['slug'] not in existing
+            ]
+            with transaction.atomic():
+                Group.objects.bulk_create(groups, ignore_conflicts=True)
+            created += len(groups)
+            skipped += len(batch) - len(groups)
+        if created:
+            page_cache.bump(group_index_scopes())
+        return created, skipped
+
+    def load_posts(self, records, options):
+        authors = dict(User.objects.values_list('username', 'pk'))
+        groups = dict(Group.objects.values_list('slug', 'pk'))
+        touched_authors, touched_groups = set(), set()
+        created = skipped = 0
+        for batch in batches(records, options['batch_size']):
+            posts, pub_dates = [], []
+            for record in batch:
+                author_id = authors.get(record.get('author'))
+                group = record.get('group') or None
+                if author_id is None or group and group not in groups:
+                    skipped += 1
+                    continue
+                pub_date = record.get('pub_date')
+                posts.append(Post(text=record['text'], author_id=author_id,
+                                  group_id=groups.get(group)))
+                pub_dates.append(parse_datetime(pub_date) if pub_date
+                                 else None)
+                touched_authors.add(record['author'])
+                if group:
+                    touched_groups.add(group)
+            if not posts:
+                continue
+            # bulk_create не отправляет сигналы: поиск получает новые
+            # строки в той же транзакции, что и сами посты.
+            with transaction.atomic():
+                Post.objects.bulk_create(posts)
+                pks = inserted_pks(posts)
+                index_posts(pks)
+                restore_pub_dates({
+                    pk: pub_date for pk, pub_date in zip(pks, pub_dates)
+                    if pub_date
+                })
+            created += len(posts)
+        # Счётчики, кеш страниц и главная лента приводятся в порядок
+        # одним проходом после загрузки.
+        if created:
+            call_command('reconcile_counters', stdout=self.stderr)
+            scopes = index_scopes() + group_index_scopes()
+            for slug in touched_groups:
+                scopes += group_scopes(slug)
+            for username in touched_authors:
+                scopes += author_scopes(username)
+            page_cache.bump(scopes)
+            drop_timeline()
+        return created, skipped
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.timeline import rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = 'Строит главную ленту в кеше заново, например после запуска'
+
+    def handle(self, *args, **options):
+        timeline = rebuild_timeline()
+        self.stdout.write(
+            f'В ленте {len(timeline["keys"])} постов '
+            f'из {timeline["count"]}'
+        )
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from posts.models import Group, Post
+from users.models import Profile
+
+User = get_user_model()
+
+
+def posts_count_subquery(field, outer_field):
+    posts = (
+        Post.objects.filter(**{field: OuterRef(outer_field)})
+        .order_by().values(field).annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(posts), 0)
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов у групп и авторов'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать расхождения, ничего не исправляя',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        with transaction.atomic():
+            missing = (
+                User.objects.filter(profile__isnull=True, posts__isnull=False)
+                .values_list('pk', flat=True).distinct()
+            )
+            missing_profiles = missing.count()
+            if not dry_run:
+                Profile.objects.bulk_create(
+                    Profile(user_id=pk) for pk in missing.iterator()
+                )
+            drifted_groups = (
+                Group.objects.annotate(actual=Count('posts'))
+                .filter(~Q(posts_count=F('actual'))).count()
+            )
+            drifted_profiles = (
+                Profile.objects.annotate(actual=Count('user__posts'))
+                .filter(~Q(posts_count=F('actual'))).count()
+            )
+            if not dry_run:
+                Group.objects.update(
+                    posts_count=posts_count_subquery('group', 'pk'))
+                Profile.objects.update(
+                    posts_count=posts_count_subquery('author', 'user_id'))
+        self.stdout.write(
+            f'Групп с расхождением: {drifted_groups}, '
+            f'профилей с расхождением: {drifted_profiles}, '
+            f'авторов без профиля: {missing_profiles}'
+            + (' (без изменений)' if dry_run else '')
+        )
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:48
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_posts_count(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    groups = Group.objects.annotate(actual=Count('posts'))
+    for group in groups.iterator():
+        Group.objects.filter(pk=group.pk).update(posts_count=group.actual)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_posts_count, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 
+from .records import FEED_FIELDS, FeedPostIterable
 
 User = get_user_model()
 
@@ -9,15 +10,34 @@ class Group(models.Model):
     title = models.CharField(max_length=200)
     slug = models.SlugField(null=False, unique=True)
     description = models.TextField()
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['title', 'id'], name='group_title_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def for_feed(self):
+        """Посты вместе с автором и группой, которые выводят ленты."""
+        return self.select_related('author', 'group')
+
+    def compact(self):
+        """Посты ленты как записи FeedPost: только нужные столбцы."""
+        clone = self.values(*FEED_FIELDS)
+        clone._iterable_class = FeedPostIterable
+        return clone
+
+
 class Post(models.Model):
     text = models.TextField(verbose_name="Текст поста",
                             help_text='Введите текст поста')
     pub_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -33,8 +53,39 @@ class Post(models.Model):
         help_text='Выберите группу'
     )
 
+    objects = PostQuerySet.as_manager()
+
     class Meta:
         ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['author', '-pub_date', '-id'],
+                         name='post_author_feed_idx'),
+            models.Index(fields=['group', '-pub_date', '-id'],
+                         name='post_group_feed_idx'),
+            models.Index(fields=['-pub_date', '-id'],
+                         name='post_feed_idx'),
+        ]
 
     def __str__(self):
         return self.text[:15]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_counted_fields()
+        return instance
+
+    def remember_counted_fields(self):
+        """Запоминает автора и группу, по которым пост учтён в счётчиках."""
+        self._counted_author_id = self.__dict__.get('author_id')
+        self._counted_group_id = self.__dict__.get('group_id')
+
+    def save(self, *args, **kwargs):
+        # Счётчики обновляются в сигналах и должны попасть
+        # в ту же транзакцию, что и сам пост.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
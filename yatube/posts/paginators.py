@@ -0,0 +1,200 @@
+import base64
+import binascii
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import InvalidPage, Page, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+def encode_cursor(direction, post):
+    raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Разбирает токен курсора в (направление, pub_date, pk)."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise InvalidCursor('Некорректный курсор')
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        raise InvalidCursor('Некорректный курсор')
+    return direction, pub_date, pk
+
+
+class CursorPage(Page):
+    """Страница, которую можно получить и по номеру, и по курсору.
+
+    У страниц, полученных по курсору, нет номера: для них не считается
+    общее количество записей, а наличие соседних страниц известно
+    заранее.
+    """
+
+    def __init__(self, object_list, number, paginator,
+                 has_next=False, has_previous=False):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self):
+        if self.number is None:
+            return self._has_next
+        return super().has_next()
+
+    def has_previous(self):
+        if self.number is None:
+            return self._has_previous
+        return super().has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next() and len(self):
+            return encode_cursor(NEXT, self[len(self) - 1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous() and len(self):
+            return encode_cursor(PREVIOUS, self[0])
+        return None
+
+
+class CursorPaginator(Paginator):
+    """Keyset-пагинация по (pub_date, id) без OFFSET и COUNT(*).
+
+    Условие на курсор записано как pub_date <= X AND (pub_date < X OR
+    id < Y): так СУБД начинает чтение индекса сразу с нужной позиции.
+
+    Нумерованные страницы (?page=) по-прежнему доступны через get_page().
+    """
+
+    ordering = ('-pub_date', '-pk')
+
+    def __init__(self, object_list, per_page, **kwargs):
+        super().__init__(object_list.order_by(*self.ordering), per_page,
+                         **kwargs)
+
+    def _get_page(self, *args, **kwargs):
+        return CursorPage(*args, **kwargs)
+
+    def first_cursor_page(self):
+        rows = list(self.object_list[:self.per_page + 1])
+        return CursorPage(rows[:self.per_page], None, self,
+                          has_next=len(rows) > self.per_page)
+
+    def cursor_page(self, cursor):
+        direction, pub_date, pk = decode_cursor(cursor)
+        if direction == NEXT:
+            rows = list(self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pk__lt=pk),
+                pub_date__lte=pub_date,
+            )[:self.per_page + 1])
+            return CursorPage(rows[:self.per_page], None, self,
+                              has_next=len(rows) > self.per_page,
+                              has_previous=True)
+        rows = list(self.object_list.filter(
+            Q(pub_date__gt=pub_date) | Q(pk__gt=pk),
+            pub_date__gte=pub_date,
+        ).order_by('pub_date', 'pk')[:self.per_page + 1])
+        if not rows:
+            return self.first_cursor_page()
+        return CursorPage(rows[:self.per_page][::-1], None, self,
+                          has_next=True,
+                          has_previous=len(rows) > self.per_page)
+
+    def get_cursor_page(self, cursor):
+        """Как get_page(): при битом курсоре отдаёт первую страницу."""
+        try:
+            return self.cursor_page(cursor)
+        except InvalidCursor:
+            return self.first_cursor_page()
+
+
+class EstimatedCountMixin:
+    """Пагинатор, который не считает COUNT(*) по большой выборке.
+
+    Если число записей известно заранее (счётчик группы или автора),
+    оно передаётся в count. Иначе записи считаются точно, пока их не
+    больше settings.POSTS_ESTIMATED_COUNT_THRESHOLD, а для больших выборок
+    точный подсчёт кешируется на settings.POSTS_ESTIMATED_COUNT_TIMEOUT
+    секунд. Если оценка разошлась с данными, page() это замечает:
+    последняя страница остаётся последней, а пустая — пересчитывается.
+    """
+
+    def __init__(self, object_list, per_page, *args, count=None, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        if count is not None:
+            self.count = count
+
+    @property
+    def count_key(self):
+        sql = str(self.object_list.order_by().values('pk').query)
+        return 'posts:count:' + hashlib.md5(sql.encode()).hexdigest()
+
+    def exact_count(self):
+        count = super().count
+        caches[settings.POSTS_PAGE_CACHE_ALIAS].set(
+            self.count_key, count, settings.POSTS_ESTIMATED_COUNT_TIMEOUT)
+        return count
+
+    @cached_property
+    def count(self):
+        # COUNT(*) по не более чем threshold + 1 строкам: для маленькой
+        # ленты это и есть точное число.
+        threshold = settings.POSTS_ESTIMATED_COUNT_THRESHOLD
+        count = self.object_list.order_by().values('pk')[
+            :threshold + 1].count()
+        if count <= threshold:
+            return count
+        count = caches[settings.POSTS_PAGE_CACHE_ALIAS].get(self.count_key)
+        if count is None:
+            count = self.exact_count()
+        return count
+
+    def set_count(self, count):
+        self.count = count
+        self.__dict__.pop('num_pages', None)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            # Оценка завышена: отдаём настоящую последнюю страницу.
+            self.set_count(self.exact_count())
+            return super().page(min(number, self.num_pages))
+        if len(rows) > self.per_page and number >= self.num_pages:
+            # Оценка занижена: за этой страницей есть ещё посты.
+            self.set_count(bottom + len(rows))
+        elif len(rows) <= self.per_page:
+            self.set_count(bottom + len(rows))
+        return self._get_page(rows[:self.per_page], number, self)
+
+
+class EstimatedCountPaginator(EstimatedCountMixin, CursorPaginator):
+    """Лента с курсорами и без точного COUNT(*)."""
+
+
+class AdminEstimatedCountPaginator(EstimatedCountMixin, Paginator):
+    """Для changelist админки: сохраняет сортировку по столбцам.
+
+    Формсет list_editable строится по object_list страницы, поэтому
+    страница остаётся QuerySet, а оценку не сверяет с данными.
+    """
+
+    page = Paginator.page
@@ -0,0 +1,83 @@
+"""Лёгкие записи постов для лент.
+
+Ленты показывают у поста только текст, даты, автора и группу, поэтому
+вместо моделей с полным набором полей они получают компактные записи
+со __slots__, собранные прямо из строк values().
+"""
+from django.db.models.query import ValuesIterable
+
+FEED_FIELDS = (
+    'pk', 'text', 'pub_date', 'updated_at',
+    'author__username', 'author__first_name', 'author__last_name',
+    'group__slug', 'group__title',
+)
+
+
+class FeedAuthor:
+    __slots__ = ('username', 'first_name', 'last_name')
+
+    def __init__(self, username, first_name, last_name):
+        self.username = username
+        self.first_name = first_name
+        self.last_name = last_name
+
+    def __str__(self):
+        return self.username
+
+    def get_full_name(self):
+        return f'{self.first_name} {self.last_name}'.strip()
+
+
+class FeedGroup:
+    __slots__ = ('slug', 'title')
+
+    def __init__(self, slug, title):
+        self.slug = slug
+        self.title = title
+
+    def __str__(self):
+        return self.title
+
+
+class FeedPost:
+    """Пост в ленте: те же атрибуты, что читают шаблоны и фиды."""
+
+    __slots__ = ('pk', 'text', 'pub_date', 'updated_at', 'author', 'group',
+                 'card_html')
+
+    def __init__(self, pk, text, pub_date, updated_at, author, group):
+        self.pk = pk
+        self.text = text
+        self.pub_date = pub_date
+        self.updated_at = updated_at
+        self.author = author
+        self.group = group
+        self.card_html = None
+
+    @property
+    def id(self):
+        return self.pk
+
+    def __str__(self):
+        return self.text[:15]
+
+    def __repr__(self):
+        return f'<FeedPost: {self.pk}>'
+
+    @classmethod
+    def from_row(cls, row):
+        group = None
+        if row['group__slug'] is not None:
+            group = FeedGroup(row['group__slug'], row['group__title'])
+        return cls(
+            row['pk'], row['text'], row['pub_date'], row['updated_at'],
+            FeedAuthor(row['author__username'], row['author__first_name'],
+                       row['author__last_name']),
+            group,
+        )
+
+
+class FeedPostIterable(ValuesIterable):
+    def __iter__(self):
+        for row in super().__iter__():
+            yield FeedPost.from_row(row)
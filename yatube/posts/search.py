@@ -0,0 +1,107 @@
+"""Полнотекстовый поиск по постам.
+
+В SQLite используется отдельная таблица FTS5 posts_post_fts, в PostgreSQL —
+GIN-индекс по to_tsvector. Таблица FTS5 обновляется из сигналов Post,
+индекс PostgreSQL СУБД поддерживает сама.
+"""
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+FTS_TABLE = 'posts_post_fts'
+PG_CONFIG = 'russian'
+# Ключей в одном IN: меньше лимита переменных старых SQLite (999).
+INDEX_CHUNK = 500
+
+
+def fts_query(query):
+    """Экранирует слова запроса, чтобы FTS5 не разбирал их как синтаксис."""
+    words = query.split()
+    return ' '.join('"{}"'.format(word.replace('"', '""')) for word in words)
+
+
+def search_posts(query):
+    """Посты, подходящие под запрос, от самых релевантных."""
+    posts = Post.objects.for_feed()
+    if connection.vendor == 'sqlite':
+        return posts.extra(
+            tables=[FTS_TABLE],
+            where=[f'{FTS_TABLE}.rowid = posts_post.id',
+                   f'{FTS_TABLE} MATCH %s'],
+            params=[fts_query(query)],
+            select={'rank': f'{FTS_TABLE}.rank'},
+            order_by=['rank', '-pub_date'],
+        )
+    if connection.vendor == 'postgresql':
+        document = f"to_tsvector('{PG_CONFIG}', posts_post.text)"
+        tsquery = f"plainto_tsquery('{PG_CONFIG}', %s)"
+        return posts.extra(
+            where=[f'{document} @@ {tsquery}'],
+            params=[query],
+            select={'rank': f'ts_rank({document}, {tsquery})'},
+            select_params=[query],
+            order_by=['-rank', '-pub_date'],
+        )
+    return posts.filter(text__icontains=query)
+
+
+def match_posts(posts, query):
+    """Оставляет в выборке подходящие под запрос посты, не меняя порядок."""
+    if connection.vendor == 'sqlite':
+        return posts.filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+            [fts_query(query)],
+        ))
+    if connection.vendor == 'postgresql':
+        return posts.extra(
+            where=[f"to_tsvector('{PG_CONFIG}', posts_post.text) @@ "
+                   f"plainto_tsquery('{PG_CONFIG}', %s)"],
+            params=[query],
+        )
+    return posts.filter(text__icontains=query)
+
+
+def index_post(post):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s',
+                       [post.pk])
+        cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, text) '
+                       f'VALUES (%s, %s)', [post.pk, post.text])
+
+
+def unindex_post(pk):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', [pk])
+
+
+def index_posts(pks):
+    """Добавляет в таблицу FTS5 новые посты, например после bulk_create."""
+    if connection.vendor != 'sqlite':
+        return
+    pks = list(pks)
+    with connection.cursor() as cursor:
+        for start in range(0, len(pks), INDEX_CHUNK):
+            chunk = pks[start:start + INDEX_CHUNK]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, text) '
+                           f'SELECT id, text FROM posts_post '
+                           f'WHERE id IN ({placeholders})', chunk)
+
+
+def rebuild_search_index(using=connection):
+    """Заполняет таблицу FTS5 заново из всех постов.
+
+    Очистка и заполнение идут в одной транзакции: поиск не увидит
+    пустую таблицу.
+    """
+    if using.vendor != 'sqlite':
+        return
+    with transaction.atomic(using=using.alias), using.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE}')
+        cursor.execute(f'INSERT INTO {FTS_TABLE} (rowid, text) '
+                       f'SELECT id, text FROM posts_post')
@@ -0,0 +1,182 @@
+from functools import partial
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from users.models import Profile
+from .cache import (author_scopes, group_index_scopes, group_scopes,
+                    index_scopes, page_cache)
+from .models import Group, Post, User
+from .search import index_post, unindex_post
+from .timeline import (drop_timeline_on_commit, timeline_post_deleted,
+                       timeline_post_saved)
+
+
+def change_author_count(author_id, delta):
+    profiles = Profile.objects.filter(user_id=author_id)
+    if delta < 0:
+        profiles.filter(posts_count__gt=0).update(
+            posts_count=F('posts_count') + delta
+        )
+    elif not profiles.update(posts_count=F('posts_count') + delta):
+        try:
+            with transaction.atomic():
+                Profile.objects.create(
+                    user_id=author_id,
+                    posts_count=Post.objects.filter(
+                        author_id=author_id).count()
+                )
+        except IntegrityError:
+            # Профиль успел создать параллельный первый пост автора.
+            profiles.update(posts_count=F('posts_count') + delta)
+
+
+def change_group_count(group_id, delta):
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gt=0)
+    if group_id is not None:
+        groups.update(posts_count=F('posts_count') + delta)
+
+
+def count_saved_post(post, created):
+    if created:
+        change_author_count(post.author_id, 1)
+        change_group_count(post.group_id, 1)
+    elif hasattr(post, '_counted_author_id'):
+        if post._counted_author_id != post.author_id:
+            change_author_count(post._counted_author_id, -1)
+            change_author_count(post.author_id, 1)
+        if post._counted_group_id != post.group_id:
+            change_group_count(post._counted_group_id, -1)
+            change_group_count(post.group_id, 1)
+
+
+def bump_on_commit(scopes):
+    # Сброс до коммита даёт гонку: запрос между сбросом и коммитом
+    # прочитает старые строки и закеширует их под новой версией.
+    transaction.on_commit(partial(page_cache.bump, scopes))
+
+
+def invalidate_post_pages(group_ids, author_names, groups_changed=False):
+    """Сбрасывает кеш только тех лент, где пост был или появился.
+
+    groups_changed — у групп поменялись счётчики или последний пост,
+    и устарел каталог групп.
+    """
+    scopes = index_scopes()
+    group_ids = {pk for pk in group_ids if pk is not None}
+    if group_ids and groups_changed:
+        scopes += group_index_scopes()
+    if group_ids:
+        slugs = Group.objects.filter(pk__in=group_ids).values_list(
+            'slug', flat=True)
+        for slug in slugs:
+            scopes += group_scopes(slug)
+    for username in author_names:
+        scopes += author_scopes(username)
+    bump_on_commit(scopes)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    counted_group_id = getattr(instance, '_counted_group_id', None)
+    count_saved_post(instance, created)
+    index_post(instance)
+    timeline_post_saved(instance, created)
+    author_names = {instance.author.username}
+    if getattr(instance, '_counted_author_id', instance.author_id) != (
+            instance.author_id):
+        author_names.update(User.objects.filter(
+            pk=instance._counted_author_id
+        ).values_list('username', flat=True))
+    invalidate_post_pages(
+        {instance.group_id, counted_group_id},
+        author_names,
+        groups_changed=created or counted_group_id != instance.group_id,
+    )
+    instance.remember_counted_fields()
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    change_author_count(instance.author_id, -1)
+    change_group_count(instance.group_id, -1)
+    unindex_post(instance.pk)
+    timeline_post_deleted(instance)
+    invalidate_post_pages({instance.group_id}, {instance.author.username},
+                          groups_changed=True)
+
+
+def saved_value(model, instance, field, raw=False):
+    """Значение поля в базе до сохранения instance, если оно там есть."""
+    if raw or instance.pk is None:
+        return None
+    return model.objects.filter(pk=instance.pk).values_list(
+        field, flat=True).first()
+
+
+def login_only(update_fields):
+    # Вход в аккаунт сохраняет только last_login — карточкам это не важно.
+    return update_fields is not None and set(update_fields) <= {
+        'last_login', 'password'}
+
+
+@receiver(pre_save, sender=Group)
+def remember_group_slug(sender, instance, raw=False, **kwargs):
+    instance._saved_slug = saved_value(Group, instance, 'slug', raw)
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # В карточках ленты есть ссылка на группу.
+    scopes = (index_scopes() + group_scopes(instance.slug)
+              + group_index_scopes())
+    old_slug = getattr(instance, '_saved_slug', None)
+    if old_slug is not None and old_slug != instance.slug:
+        # Страница под старым адресом должна отвечать 404, а профили
+        # авторов группы — ссылаться на новый.
+        scopes += group_scopes(old_slug)
+        usernames = User.objects.filter(posts__group=instance).distinct()
+        for username in usernames.values_list('username', flat=True):
+            scopes += author_scopes(username)
+    bump_on_commit(scopes)
+    drop_timeline_on_commit()
+
+
+@receiver(post_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    bump_on_commit(index_scopes() + group_scopes(instance.slug)
+                   + group_index_scopes())
+    drop_timeline_on_commit()
+
+
+@receiver(pre_save, sender=User)
+def remember_username(sender, instance, raw=False, update_fields=None,
+                      **kwargs):
+    if not login_only(update_fields):
+        instance._saved_username = saved_value(User, instance, 'username',
+                                               raw)
+
+
+@receiver(post_save, sender=User)
+def author_saved(sender, instance, created=False, raw=False,
+                 update_fields=None, **kwargs):
+    if raw or created or login_only(update_fields):
+        return
+    # В карточках ленты и групп есть имя автора и ссылка на его профиль.
+    scopes = index_scopes() + author_scopes(instance.username)
+    old_username = getattr(instance, '_saved_username', None)
+    if old_username is not None and old_username != instance.username:
+        scopes += author_scopes(old_username)
+    slugs = Group.objects.filter(posts__author=instance).distinct()
+    for slug in slugs.values_list('slug', flat=True):
+        scopes += group_scopes(slug)
+    bump_on_commit(scopes)
+    drop_timeline_on_commit()
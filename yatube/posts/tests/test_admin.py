@@ -0,0 +1,89 @@
+from django.contrib.admin import helpers, site
+from django.contrib.auth import get_user_model
+from django.forms import HiddenInput
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.admin = User.objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        cls.other_group = Group.objects.create(title='группа1',
+                                               slug='test_slug1',
+                                               description='описание1')
+        for i in range(5):
+            Post.objects.create(text=f'Обычный пост {i}', author=cls.admin,
+                                group=cls.group)
+        cls.post = Post.objects.create(text='Редкое слово', author=cls.admin)
+
+    def setUp(self):
+        self.admin_client = Client()
+        self.admin_client.force_login(self.admin)
+        self.url = reverse('admin:posts_post_changelist')
+
+    def test_changelist_queries_do_not_depend_on_rows(self):
+        """Changelist не делает запросов на каждую строку."""
+        with self.assertNumQueries(4):
+            response = self.admin_client.get(self.url)
+        self.assertContains(response, 'admin-autocomplete')
+        self.assertContains(
+            response, f'<option value="{self.group.pk}" selected>группа0')
+        Post.objects.bulk_create(
+            Post(text='Ещё пост', author=self.admin, group=self.other_group)
+            for _ in range(20))
+        with self.assertNumQueries(4):
+            self.admin_client.get(self.url)
+
+    def test_row_markup_matches_django_templates(self):
+        """Виджеты строки без шаблонов пишут ту же разметку."""
+        formset = self.admin_client.get(self.url).context['cl'].formset
+        form = formset.forms[-1]
+        self.assertEqual(form.instance.group, self.group)
+        group, pk = form['group'], form['id']
+        widget = group.field.widget
+        fast = str(group)
+        widget.loaded = None
+        self.assertHTMLEqual(fast, str(group))
+        self.assertEqual(
+            str(pk), HiddenInput(pk.field.widget.attrs).render(
+                pk.html_name, pk.value(), {'id': pk.auto_id}))
+        admin = site._registry[Post]
+        self.assertEqual(admin.action_checkbox(self.post),
+                         helpers.checkbox.render(helpers.ACTION_CHECKBOX_NAME,
+                                                 str(self.post.pk)))
+
+    def test_search_uses_full_text_index(self):
+        response = self.admin_client.get(self.url, {'q': 'редкое'})
+        self.assertEqual(list(response.context['cl'].result_list),
+                         [self.post])
+
+    def test_group_editable_from_changelist(self):
+        posts = list(Post.objects.order_by('-pk'))
+        data = {
+            'form-TOTAL_FORMS': len(posts),
+            'form-INITIAL_FORMS': len(posts),
+            '_save': 'Сохранить',
+        }
+        for number, post in enumerate(posts):
+            data[f'form-{number}-id'] = post.pk
+            data[f'form-{number}-group'] = post.group_id or ''
+        data['form-0-group'] = self.other_group.pk
+        response = self.admin_client.post(self.url, data)
+        self.assertEqual(response.status_code, 302)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.group, self.other_group)
+
+    def test_group_autocomplete(self):
+        response = self.admin_client.get(
+            reverse('admin:posts_group_autocomplete'), {'term': 'группа1'})
+        self.assertEqual([item['text'] for item in response.json()['results']],
+                         ['группа1'])
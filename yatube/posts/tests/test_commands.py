@@ -0,0 +1,121 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ImportExportCommandsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        Post.objects.create(text='Пост в группе', author=cls.user,
+                            group=cls.group)
+        Post.objects.create(text='Пост, с запятой и "кавычками"',
+                            author=cls.user)
+
+    def roundtrip(self, fmt):
+        exported = {}
+        for model in ('group', 'post'):
+            out = StringIO()
+            call_command('export_posts', model=model, format=fmt,
+                         stdout=out, stderr=StringIO())
+            exported[model] = out.getvalue()
+        old_posts = list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'))
+        Post.objects.all().delete()
+        Group.objects.all().delete()
+        for model in ('group', 'post'):
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8',
+                                             delete=False) as dump:
+                dump.write(exported[model])
+            self.addCleanup(os.remove, dump.name)
+            call_command('import_posts', dump.name, model=model, format=fmt,
+                         batch_size=1, stdout=StringIO(), stderr=StringIO())
+        new_posts = list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'))
+        self.assertEqual(new_posts, old_posts)
+        self.assertEqual(Group.objects.get().posts_count, 1)
+
+    def test_ndjson_roundtrip(self):
+        self.roundtrip('ndjson')
+
+    def test_csv_roundtrip(self):
+        self.roundtrip('csv')
+
+    def import_lines(self, *lines, **options):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8',
+                                         delete=False) as dump:
+            dump.write(''.join(line + '\n' for line in lines))
+        self.addCleanup(os.remove, dump.name)
+        out = StringIO()
+        call_command('import_posts', dump.name, stdout=out,
+                     stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_unknown_author_skipped(self):
+        out = self.import_lines('{"text": "Чужой пост", "author": "nobody"}')
+        self.assertIn('пропущено: 1', out)
+        self.assertFalse(Post.objects.filter(text='Чужой пост').exists())
+
+    def test_unknown_group_skipped(self):
+        out = self.import_lines(
+            '{"text": "Пост без группы", "author": "Test_User", '
+            '"group": "nowhere"}')
+        self.assertIn('пропущено: 1', out)
+        self.assertFalse(Post.objects.filter(text='Пост без группы').exists())
+
+    def test_pub_dates_kept_within_batch(self):
+        """Даты из выгрузки попадают в свои строки пачки, без даты — now.
+
+        Поле pub_date общее для процесса: импорт не выключает
+        у него auto_now_add.
+        """
+        field = Post._meta.get_field('pub_date')
+        bulk_create = Post.objects.bulk_create
+        auto_now_add = []
+
+        def spy(*args, **kwargs):
+            auto_now_add.append(field.auto_now_add)
+            return bulk_create(*args, **kwargs)
+
+        with mock.patch.object(Post.objects, 'bulk_create', spy):
+            out = self.import_lines(
+                '{"text": "Первый", "author": "Test_User", '
+                '"pub_date": "2020-03-01T10:00:00+00:00"}',
+                '{"text": "Без даты", "author": "Test_User"}',
+                '{"text": "Чужой", "author": "nobody", '
+                '"pub_date": "2020-02-01T10:00:00+00:00"}',
+                '{"text": "Второй", "author": "Test_User", '
+                '"group": "test_slug0", '
+                '"pub_date": "2019-01-01T10:00:00+00:00"}',
+                batch_size=10)
+        self.assertIn('Загружено строк: 3, пропущено: 1', out)
+        dates = dict(Post.objects.values_list('text', 'pub_date'))
+        self.assertEqual(dates['Первый'].isoformat(),
+                         '2020-03-01T10:00:00+00:00')
+        self.assertEqual(dates['Второй'].isoformat(),
+                         '2019-01-01T10:00:00+00:00')
+        self.assertGreater(dates['Без даты'].year, 2020)
+        self.assertEqual(auto_now_add, [True])
+
+    def test_imported_posts_found_by_search(self):
+        self.import_lines(
+            '{"text": "Импортированный ёжик", "author": "Test_User"}',
+            '{"text": "Ещё один ёжик", "author": "Test_User"}',
+            batch_size=1)
+        response = Client().get(reverse('posts:search'), {'q': 'ёжик'})
+        self.assertEqual(len(response.context['page_obj']), 2)
+        response = Client().get(reverse('posts:search'), {'q': 'кавычками'})
+        self.assertEqual(len(response.context['page_obj']), 1)
@@ -0,0 +1,167 @@
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Group, Post
+from posts.tests.utils import SharedCacheMixin, run_on_commit
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        cls.post = Post.objects.create(text='Тестовый текст',
+                                       author=cls.user, group=cls.group)
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+            reverse('posts:post_detail', kwargs={'post_id': cls.post.pk}),
+        )
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def get_etags(self):
+        return {url: self.authorized_client.get(url)['ETag']
+                for url in self.urls}
+
+    def test_same_version_returns_304(self):
+        for url, etag in self.get_etags().items():
+            with self.subTest(url=url):
+                response = self.authorized_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_version(self):
+        """Правка через post_edit делает старый ETag недействительным."""
+        etags = self.get_etags()
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Новый текст', 'group': self.group.pk}
+        )
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.authorized_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_other_user_gets_own_version(self):
+        url = reverse('posts:index')
+        etag = self.authorized_client.get(url)['ETag']
+        response = Client().get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class LastModifiedTests(SharedCacheMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0')
+        old_post = Post.objects.create(text='Старый пост', author=cls.user,
+                                       group=cls.group)
+        Post.objects.create(text='Новый пост', author=cls.user,
+                            group=cls.group)
+        cls.feed_urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        )
+        cls.detail_url = reverse('posts:post_detail',
+                                 kwargs={'post_id': old_post.pk})
+        cls.urls = cls.feed_urls + (cls.detail_url,)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        # Посты и отметки сброса областей — час назад, чтобы
+        # Last-Modified не попадал в текущую секунду.
+        Post.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        hour_ago = mock.Mock(time=lambda: time.time() - 3600,
+                             time_ns=time.time_ns)
+        with mock.patch('posts.cache.time', hour_ago):
+            self.last_modified = {
+                url: self.guest_client.get(url)['Last-Modified']
+                for url in self.urls
+            }
+
+    def test_deleting_newest_post_moves_last_modified_forward(self):
+        """После удаления свежего поста If-Modified-Since не даёт 304."""
+        with run_on_commit():
+            Post.objects.get(text='Новый пост').delete()
+        for url, last_modified in self.last_modified.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotContains(response, 'Новый пост')
+
+    def test_unchanged_page_returns_304(self):
+        for url, last_modified in self.last_modified.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified)
+                self.assertEqual(response.status_code, 304)
+
+    def test_author_rename_changes_etag(self):
+        """Имя автора в карточках входит в версию страницы."""
+        etags = {url: self.guest_client.get(url)['ETag']
+                 for url in self.feed_urls}
+        self.user.first_name = 'Новое'
+        self.user.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 200)
+
+    def test_post_detail_follows_author_and_group(self):
+        """Новый пост автора и переименования не трогают updated_at."""
+        with run_on_commit():
+            Post.objects.create(text='Ещё пост', author=self.user)
+            self.user.username = 'Renamed_User'
+            self.user.save()
+            self.group.slug = 'renamed_slug'
+            self.group.save()
+        response = self.guest_client.get(
+            self.detail_url,
+            HTTP_IF_MODIFIED_SINCE=self.last_modified[self.detail_url])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['posts_count'], 3)
+        self.assertContains(response, 'Renamed_User')
+        self.assertContains(response, 'renamed_slug')
+
+    def test_post_detail_etag_follows_username(self):
+        etag = self.guest_client.get(self.detail_url)['ETag']
+        self.user.username = 'Renamed_User'
+        self.user.save()
+        response = self.guest_client.get(self.detail_url,
+                                         HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_no_last_modified_with_process_local_cache(self):
+        """Отметки сброса в LocMemCache у каждого процесса свои."""
+        cache.clear()
+        hour_ago = mock.Mock(time=lambda: time.time() - 3600,
+                             time_ns=time.time_ns)
+        for url in self.urls:
+            with self.subTest(url=url), \
+                    mock.patch('posts.cache.time', hour_ago):
+                response = self.guest_client.get(url)
+                self.assertNotIn('Last-Modified', response)
+                self.assertIn('ETag', response)
@@ -0,0 +1,88 @@
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from users.models import Profile
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        cls.other_group = Group.objects.create(title='группа1',
+                                               slug='test_slug1',
+                                               description='описание1')
+
+    def setUp(self):
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def assertCounters(self, author, group, other_group):
+        self.assertEqual(Profile.objects.get(user=self.user).posts_count,
+                         author)
+        self.group.refresh_from_db()
+        self.other_group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, group)
+        self.assertEqual(self.other_group.posts_count, other_group)
+
+    def test_counters_follow_create_edit_delete(self):
+        """Счётчики меняются при создании, смене группы и удалении."""
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Тестовый текст', 'group': self.group.pk}
+        )
+        post = Post.objects.get()
+        self.assertCounters(1, 1, 0)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': post.pk}),
+            data={'text': 'Тестовый текст', 'group': self.other_group.pk}
+        )
+        self.assertCounters(1, 0, 1)
+        Post.objects.get().delete()
+        self.assertCounters(0, 0, 0)
+
+    def test_concurrent_first_posts(self):
+        """Профиль, созданный параллельным первым постом, не роняет пост."""
+        author = User.objects.create(username='Racing_User')
+        # Параллельный запрос создал профиль уже после того, как update()
+        # этого поста ничего не нашёл.
+        Profile.objects.create(user=author, posts_count=1)
+        update = QuerySet.update
+        missed = []
+
+        def racing_update(queryset, **kwargs):
+            if queryset.model is Profile and not missed:
+                missed.append(True)
+                return 0
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', racing_update):
+            Post.objects.create(text='Первый пост', author=author)
+        self.assertEqual(Profile.objects.get(user=author).posts_count, 2)
+
+    def test_profile_shows_counter(self):
+        Post.objects.create(text='Тестовый текст', author=self.user)
+        response = self.authorized_client.get(
+            reverse('posts:profile', kwargs={'username': self.user.username}))
+        self.assertEqual(response.context['posts_count'], 1)
+
+    def test_reconcile_counters_fixes_drift(self):
+        Post.objects.create(text='Тестовый текст', author=self.user,
+                            group=self.group)
+        Group.objects.update(posts_count=7)
+        Profile.objects.all().delete()
+        out = StringIO()
+        call_command('reconcile_counters', stdout=out)
+        self.assertIn('Групп с расхождением: 2', out.getvalue())
+        self.assertCounters(1, 1, 0)
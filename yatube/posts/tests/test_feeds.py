@@ -0,0 +1,101 @@
+import json
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.models import Group, Post
+from posts.tests.utils import SharedCacheMixin, run_on_commit
+
+User = get_user_model()
+
+
+class PostFeedsTests(SharedCacheMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        Post.objects.create(text='Пост в группе', author=cls.user,
+                            group=cls.group)
+        Post.objects.create(text='Пост <без> группы', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def get_json(self, url):
+        response = self.guest_client.get(url)
+        return json.loads(b''.join(response.streaming_content))
+
+    def test_json_feeds(self):
+        feeds = {
+            reverse('posts:feed_json'): 2,
+            reverse('posts:group_feed_json', args=[self.group.slug]): 1,
+            reverse('posts:profile_feed_json', args=[self.user.username]): 2,
+        }
+        for url, count in feeds.items():
+            with self.subTest(url=url):
+                self.assertEqual(len(self.get_json(url)['items']), count)
+
+    def test_rss_feed_escapes_text(self):
+        response = self.guest_client.get(reverse('posts:feed_rss'))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn('Пост &lt;без&gt; группы', content)
+
+    def test_conditional_get_returns_304(self):
+        url = reverse('posts:feed_json')
+        response = self.guest_client.get(url)
+        with self.assertNumQueries(1):
+            cached = self.guest_client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        Post.objects.create(text='Новый пост', author=self.user)
+        fresh = self.guest_client.get(url,
+                                      HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+
+    def test_deleting_newest_post_moves_last_modified_forward(self):
+        """После удаления свежего поста If-Modified-Since не даёт 304."""
+        cache.clear()
+        Post.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        hour_ago = mock.Mock(time=lambda: time.time() - 3600,
+                             time_ns=time.time_ns)
+        urls = [reverse('posts:feed_json'), reverse('posts:feed_rss')]
+        with mock.patch('posts.cache.time', hour_ago):
+            last_modified = {url: self.guest_client.get(url)['Last-Modified']
+                             for url in urls}
+        for url in urls:
+            with self.subTest(url=url):
+                cached = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified[url])
+                self.assertEqual(cached.status_code, 304)
+        with run_on_commit():
+            Post.objects.filter(text='Пост <без> группы').get().delete()
+        for url in urls:
+            with self.subTest(url=url):
+                fresh = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=last_modified[url])
+                self.assertEqual(fresh.status_code, 200)
+
+    @override_settings(CACHES={'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_no_last_modified_with_process_local_cache(self):
+        cache.clear()
+        Post.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        hour_ago = mock.Mock(time=lambda: time.time() - 3600,
+                             time_ns=time.time_ns)
+        with mock.patch('posts.cache.time', hour_ago):
+            response = self.guest_client.get(reverse('posts:feed_json'))
+        self.assertNotIn('Last-Modified', response)
+        self.assertIn('ETag', response)
+
+    def test_unknown_group_feed_not_found(self):
+        response = self.guest_client.get(
+            reverse('posts:group_feed_rss', args=['unknown']))
+        self.assertEqual(response.status_code, 404)
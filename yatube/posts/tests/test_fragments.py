@@ -0,0 +1,85 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.utils import NUM_OF_POSTS
+
+User = get_user_model()
+
+
+class FeedFragmentTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        for i in range(NUM_OF_POSTS + 3):
+            Post.objects.create(text=f'Пост номер {i}.', author=cls.user,
+                                group=cls.group if i % 2 else None)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def next_cursor(self, url):
+        response = self.guest_client.get(url)
+        return response.context['page_obj'].next_cursor
+
+    def test_index_fragment_continues_first_page(self):
+        """Фрагмент отдаёт карточки после первой страницы без base.html."""
+        cursor = self.next_cursor(reverse('posts:index'))
+        with self.assertNumQueries(1):
+            response = self.guest_client.get(
+                reverse('posts:index_fragment'), {'cursor': cursor})
+        content = response.content.decode()
+        self.assertEqual(content.count('<article>'), 3)
+        self.assertIn('Пост номер 0.', content)
+        self.assertNotIn('Пост номер 3.', content)
+        self.assertNotIn('<html', content)
+        self.assertNotIn('X-Next-Cursor', response)
+
+    def test_group_fragment_json(self):
+        url = reverse('posts:group_fragment', args=[self.group.slug])
+        response = self.guest_client.get(url, {'format': 'json'})
+        data = response.json()
+        self.assertEqual(data['html'].count('<article>'), 6)
+        self.assertIsNone(data['next_cursor'])
+
+    def test_fragment_header_points_to_next_portion(self):
+        response = self.guest_client.get(reverse('posts:index_fragment'))
+        self.assertEqual(response.content.decode().count('<article>'),
+                         NUM_OF_POSTS)
+        following = self.guest_client.get(
+            reverse('posts:index_fragment'),
+            {'cursor': response['X-Next-Cursor']})
+        self.assertEqual(following.content.decode().count('<article>'), 3)
+
+    def test_pages_expose_fragment_hook(self):
+        pages = {
+            reverse('posts:index'): reverse('posts:index_fragment'),
+            reverse('posts:group_list', args=[self.group.slug]):
+                reverse('posts:group_fragment', args=[self.group.slug]),
+        }
+        for url, fragment_url in pages.items():
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertContains(
+                    response, f'data-fragment-url="{fragment_url}"')
+                self.assertContains(response, 'js/infinite_scroll.js')
+
+    def test_unknown_group_fragment_not_found(self):
+        """Как и страница группы, фрагмент неизвестной группы — 404."""
+        for params in ({}, {'format': 'json'}):
+            with self.subTest(params=params):
+                response = self.guest_client.get(
+                    reverse('posts:group_fragment', args=['unknown']),
+                    params)
+                self.assertEqual(response.status_code, 404)
+
+    def test_empty_group_fragment(self):
+        group = Group.objects.create(title='пустая', slug='empty')
+        response = self.guest_client.get(
+            reverse('posts:group_fragment', args=[group.slug]))
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-Next-Cursor', response)
@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+import os
+import tempfile
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import formats
+
+from posts.cache import page_cache
+from posts.models import Group, Post
+from posts.tests.utils import run_on_commit
+
+User = get_user_model()
+
+
+class GroupIndexTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        cls.other_group = Group.objects.create(title='группа1',
+                                               slug='test_slug1',
+                                               description='описание1')
+        Post.objects.create(text='Первый пост', author=cls.user,
+                            group=cls.group)
+        cls.post = Post.objects.create(text='Второй пост', author=cls.user,
+                                       group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        page_cache.local.clear()
+        self.guest_client = Client()
+        self.url = reverse('posts:group_index')
+
+    def test_groups_with_counts_and_last_post(self):
+        """Каталог показывает число постов и время последнего поста."""
+        response = self.guest_client.get(self.url)
+        groups = {group.slug: group for group in response.context['page_obj']}
+        self.assertEqual(groups['test_slug0'].posts_count, 2)
+        self.assertEqual(groups['test_slug0'].last_post_at,
+                         self.post.pub_date)
+        self.assertIsNone(groups['test_slug1'].last_post_at)
+        self.assertContains(response, formats.date_format(
+            self.post.pub_date.astimezone(), 'd E Y H:i'))
+
+    def test_queries_do_not_depend_on_number_of_groups(self):
+        self.guest_client.get(self.url)
+        for i in range(20):
+            group = Group.objects.create(title=f'новая{i}', slug=f'new{i}')
+            Post.objects.create(text='Пост', author=self.user, group=group)
+        with self.assertNumQueries(3):
+            self.guest_client.get(self.url)
+
+    @skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN SQLite')
+    def test_only_page_groups_get_last_post_subquery(self):
+        """Подзапрос последнего поста не идёт по всей таблице групп."""
+        Group.objects.bulk_create(
+            Group(title=f'группа{i:03}', slug=f'many{i}') for i in range(60))
+        with CaptureQueriesContext(connection) as captured:
+            self.guest_client.get(self.url)
+        with connection.cursor() as cursor:
+            for query in captured:
+                cursor.execute('EXPLAIN QUERY PLAN ' + query['sql'])
+                plan = ' | '.join(row[-1] for row in cursor.fetchall())
+                with self.subTest(sql=query['sql']):
+                    self.assertNotIn('TEMP B-TREE', plan)
+                    if 'CORRELATED' in plan:
+                        self.assertNotIn('SCAN posts_group', plan)
+
+    @override_settings(POSTS_PAGE_CACHE={'group_index': True})
+    def test_cache_invalidated_when_post_group_changes(self):
+        self.guest_client.get(self.url)
+        self.post.text = 'Исправленный пост'
+        with run_on_commit():
+            self.post.save()
+        with self.assertNumQueries(0):
+            self.guest_client.get(self.url)
+        self.post.group = self.other_group
+        with run_on_commit():
+            self.post.save()
+        response = self.guest_client.get(self.url)
+        groups = {group.slug: group for group in response.context['page_obj']}
+        self.assertEqual(groups['test_slug0'].posts_count, 1)
+        self.assertEqual(groups['test_slug1'].posts_count, 1)
+
+    def import_records(self, model, lines):
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8',
+                                         delete=False) as dump:
+            dump.write('\n'.join(lines) + '\n')
+        self.addCleanup(os.remove, dump.name)
+        call_command('import_posts', dump.name, model=model,
+                     stdout=StringIO(), stderr=StringIO())
+
+    @override_settings(POSTS_PAGE_CACHE={'group_index': True})
+    def test_cache_invalidated_by_import(self):
+        """Загрузка групп и постов сбрасывает кешированный каталог."""
+        self.guest_client.get(self.url)
+        self.import_records('group', [
+            '{"title": "Новая группа", "slug": "imported"}'])
+        response = self.guest_client.get(self.url)
+        self.assertContains(response, 'Новая группа')
+        self.import_records('post', [
+            '{"text": "Загруженный", "author": "Test_User", '
+            '"group": "imported"}'])
+        response = self.guest_client.get(self.url)
+        groups = {group.slug: group for group in response.context['page_obj']}
+        self.assertEqual(groups['imported'].posts_count, 1)
@@ -0,0 +1,93 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.paginators import encode_cursor, NEXT
+
+User = get_user_model()
+
+NUM_OF_AUTHORS = 20
+NUM_OF_GROUPS = 20
+NUM_OF_POSTS = 3000
+
+
+def explain(sql):
+    """План запроса одной строкой для поддерживаемых СУБД."""
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return ' | '.join(row[-1] for row in cursor.fetchall())
+        cursor.execute('EXPLAIN ' + sql)
+        return ' | '.join(row[0] for row in cursor.fetchall())
+
+
+def plan_problems(plan):
+    if connection.vendor == 'sqlite':
+        full_scan = ('SCAN posts_post' in plan
+                     and 'INDEX' not in plan.split('SCAN posts_post')[1])
+        filesort = 'USE TEMP B-TREE FOR ORDER BY' in plan
+    else:
+        full_scan = 'Seq Scan on posts_post' in plan
+        filesort = 'Sort Key' in plan
+    return full_scan, filesort
+
+
+class PostFeedIndexesTests(TestCase):
+    """Запросы всех страниц posts идут по индексам и без сортировки."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            return
+        User.objects.bulk_create(
+            User(username=f'author{i}') for i in range(NUM_OF_AUTHORS)
+        )
+        Group.objects.bulk_create(
+            Group(title=f'группа{i}', slug=f'slug{i}', description='описание')
+            for i in range(NUM_OF_GROUPS)
+        )
+        authors = list(User.objects.all())
+        groups = list(Group.objects.all()) + [None]
+        Post.objects.bulk_create(
+            Post(text=f'Текст {i}', author=authors[i % len(authors)],
+                 group=groups[i % len(groups)])
+            for i in range(NUM_OF_POSTS)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.post = Post.objects.filter(group__isnull=False).last()
+
+    def setUp(self):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            self.skipTest('План запроса проверяется только для SQLite '
+                          'и PostgreSQL')
+        self.guest_client = Client()
+
+    def test_views_use_indexes(self):
+        cursor = encode_cursor(NEXT, self.post)
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=100',
+            reverse('posts:index') + f'?cursor={cursor}',
+            reverse('posts:group_list', kwargs={'slug': 'slug1'}),
+            reverse('posts:group_list', kwargs={'slug': 'slug1'}) + '?page=5',
+            reverse('posts:profile', kwargs={'username': 'author1'}),
+            reverse('posts:profile', kwargs={'username': 'author1'})
+            + '?page=5',
+            reverse('posts:post_detail', kwargs={'post_id': self.post.pk}),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    self.guest_client.get(url)
+                for query in queries:
+                    if 'posts_post' not in query['sql']:
+                        continue
+                    plan = explain(query['sql'])
+                    full_scan, filesort = plan_problems(plan)
+                    self.assertFalse(full_scan, f'{query["sql"]}\n{plan}')
+                    self.assertFalse(filesort, f'{query["sql"]}\n{plan}')
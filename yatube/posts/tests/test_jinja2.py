@@ -0,0 +1,82 @@
+import importlib.util
+import os
+import re
+from datetime import date
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.utils import NUM_OF_POSTS
+
+User = get_user_model()
+
+JINJA2_TEMPLATES = settings.TEMPLATES[:1] + [{
+    'BACKEND': 'django.template.backends.jinja2.Jinja2',
+    'DIRS': [os.path.join(settings.BASE_DIR, 'jinja2')],
+    'OPTIONS': {
+        'environment': 'core.jinja2.environment',
+        'context_processors': settings.TEMPLATES[0]['OPTIONS'][
+            'context_processors'],
+    },
+}]
+
+
+def links(response):
+    return re.findall(r'href="([^"]*)"', response.content.decode())
+
+
+@skipUnless(importlib.util.find_spec('jinja2'), 'Jinja2 не установлен')
+class Jinja2FeedTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User',
+                                       first_name='Имя', last_name='Фамилия')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        for i in range(NUM_OF_POSTS + 3):
+            Post.objects.create(text=f'Пост номер {i}.', author=cls.user,
+                                group=cls.group if i % 2 else None)
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def get(self, url, engine, **params):
+        with self.settings(POSTS_TEMPLATE_ENGINE=engine):
+            return self.client.get(url, params)
+
+    @override_settings(TEMPLATES=JINJA2_TEMPLATES)
+    def test_feeds_match_django_templates(self):
+        """Страницы лент на Jinja2 ведут по тем же ссылкам, что и DTL."""
+        urls = [
+            reverse('posts:index'),
+            reverse('posts:index') + '?page=2',
+            reverse('posts:group_list', args=[self.group.slug]),
+            reverse('posts:profile', args=[self.user.username]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                jinja = self.get(url, 'jinja2')
+                self.assertEqual(jinja.status_code, 200)
+                self.assertEqual(links(jinja), links(self.get(url, 'django')))
+
+    @override_settings(TEMPLATES=JINJA2_TEMPLATES)
+    def test_card_and_context_processors(self):
+        content = self.get(reverse('posts:index'), 'jinja2').content.decode()
+        self.assertEqual(content.count('<article>'), NUM_OF_POSTS)
+        self.assertIn('Автор: Имя Фамилия', content)
+        self.assertIn(f'Пост номер {NUM_OF_POSTS + 2}.', content)
+        self.assertIn(f'© {date.today().year} Copyright', content)
+        self.assertIn(f'Пользователь: {self.user.username}', content)
+
+    @override_settings(TEMPLATES=JINJA2_TEMPLATES)
+    def test_fragment(self):
+        response = self.get(reverse('posts:index_fragment'), 'jinja2')
+        self.assertEqual(response.content.decode().count('<hr>'),
+                         NUM_OF_POSTS)
+        self.assertIn('X-Next-Cursor', response)
@@ -0,0 +1,152 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.cache import page_cache
+from posts.models import Group, Post
+from posts.tests.utils import run_on_commit
+
+User = get_user_model()
+
+ALL_VIEWS = {'index': True, 'group_list': True, 'profile': True}
+
+
+@override_settings(POSTS_PAGE_CACHE=ALL_VIEWS)
+class PageCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        cls.other_group = Group.objects.create(title='группа1',
+                                               slug='test_slug1',
+                                               description='описание1')
+        Post.objects.create(text='Первый пост', author=cls.user,
+                            group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        page_cache.local.clear()
+        self.guest_client = Client()
+
+    def test_anonymous_page_served_from_cache(self):
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(url)
+        self.assertContains(response, 'Первый пост')
+
+    def test_new_post_invalidates_only_affected_pages(self):
+        index_url = reverse('posts:index')
+        group_url = reverse('posts:group_list',
+                            kwargs={'slug': self.group.slug})
+        other_url = reverse('posts:group_list',
+                            kwargs={'slug': self.other_group.slug})
+        for url in (index_url, group_url, other_url):
+            self.guest_client.get(url)
+        with run_on_commit():
+            Post.objects.create(text='Второй пост', author=self.user,
+                                group=self.group)
+        self.assertContains(self.guest_client.get(index_url), 'Второй пост')
+        self.assertContains(self.guest_client.get(group_url), 'Второй пост')
+        with self.assertNumQueries(0):
+            self.guest_client.get(other_url)
+
+    def test_pages_invalidated_after_commit(self):
+        """До коммита кеш не сбрасывается: иначе чтение между сбросом
+        и коммитом закешировало бы старые строки под новой версией."""
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        with run_on_commit():
+            Post.objects.create(text='Второй пост', author=self.user)
+            with self.assertNumQueries(0):
+                self.guest_client.get(url)
+        self.assertContains(self.guest_client.get(url), 'Второй пост')
+
+    def test_group_slug_change_drops_old_pages(self):
+        """Старый адрес группы отвечает 404, профили ведут на новый."""
+        old_url = reverse('posts:group_list', args=[self.group.slug])
+        profile_url = reverse('posts:profile', args=[self.user.username])
+        self.guest_client.get(old_url)
+        self.guest_client.get(profile_url)
+        group = Group.objects.get(pk=self.group.pk)
+        with run_on_commit():
+            group.slug = 'new_slug'
+            group.save()
+        self.assertEqual(self.guest_client.get(old_url).status_code, 404)
+        response = self.guest_client.get(profile_url)
+        self.assertContains(response, '/group/new_slug/')
+        self.assertNotContains(response, old_url)
+
+    def test_username_change_drops_old_pages(self):
+        """Старый профиль отвечает 404, лента группы — с новым именем."""
+        old_url = reverse('posts:profile', args=[self.user.username])
+        group_url = reverse('posts:group_list', args=[self.group.slug])
+        self.guest_client.get(old_url)
+        self.guest_client.get(group_url)
+        user = User.objects.get(pk=self.user.pk)
+        with run_on_commit():
+            user.username = 'New_User'
+            user.save()
+        self.assertEqual(self.guest_client.get(old_url).status_code, 404)
+        self.assertContains(self.guest_client.get(group_url),
+                            '/profile/New_User/')
+
+    @override_settings(POSTS_PAGE_CACHE={'index': False})
+    def test_cache_disabled_per_view(self):
+        url = reverse('posts:index')
+        self.guest_client.get(url)
+        response = self.guest_client.get(url)
+        self.assertIn('page_obj', response.context)
+
+    def test_authorized_user_not_cached(self):
+        authorized_client = Client()
+        authorized_client.force_login(self.user)
+        url = reverse('posts:index')
+        authorized_client.get(url)
+        response = authorized_client.get(url)
+        self.assertIn('page_obj', response.context)
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='old_slug')
+        cls.post = Post.objects.create(text='Старый текст', author=cls.user,
+                                       group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def test_edit_renders_new_card(self):
+        """После редактирования карточка поста рендерится заново."""
+        url = reverse('posts:index')
+        self.assertContains(self.authorized_client.get(url), 'Старый текст')
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': self.post.pk}),
+            data={'text': 'Новый текст'}
+        )
+        response = self.authorized_client.get(url)
+        self.assertContains(response, 'Новый текст')
+        self.assertNotContains(response, 'Старый текст')
+
+    def test_author_and_group_changes_render_new_card(self):
+        """Карточка не держит старые имя автора и ссылку на группу."""
+        url = reverse('posts:index')
+        self.authorized_client.get(url)
+        self.group.slug = 'new_slug'
+        self.group.save()
+        self.user.first_name = 'Новое'
+        self.user.last_name = 'Имя'
+        self.user.save()
+        response = self.authorized_client.get(url)
+        self.assertContains(response, reverse('posts:group_list',
+                                              args=['new_slug']))
+        self.assertNotContains(response, '/group/old_slug/')
+        self.assertContains(response, 'Автор: Новое Имя')
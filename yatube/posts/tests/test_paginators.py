@@ -0,0 +1,125 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Post
+from posts.paginators import (CursorPaginator, EstimatedCountPaginator,
+                              encode_cursor, NEXT)
+
+User = get_user_model()
+
+
+class CursorPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый текст {i}', author=cls.user)
+            for i in range(13)
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def test_cursor_pages_follow_numbered_pages(self):
+        """Курсор со страницы 1 ведёт на те же записи, что и ?page=2."""
+        first = self.guest_client.get(reverse('posts:index'))
+        second = self.guest_client.get(reverse('posts:index') + '?page=2')
+        cursor = first.context['page_obj'].next_cursor
+        response = self.guest_client.get(
+            reverse('posts:index') + f'?cursor={cursor}')
+        page_obj = response.context['page_obj']
+        self.assertEqual(
+            [post.pk for post in page_obj],
+            [post.pk for post in second.context['page_obj']]
+        )
+        self.assertFalse(page_obj.has_next())
+        self.assertTrue(page_obj.has_previous())
+
+    def test_previous_cursor_returns_back(self):
+        """Курсор назад возвращает предыдущую страницу целиком."""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        second = paginator.cursor_page(paginator.page(1).next_cursor)
+        first = paginator.cursor_page(second.previous_cursor)
+        self.assertEqual(
+            [post.pk for post in first],
+            [post.pk for post in paginator.page(1)]
+        )
+        self.assertFalse(first.has_previous())
+
+    def test_cursor_page_skips_count(self):
+        """Страница по курсору строится одним запросом без COUNT."""
+        paginator = CursorPaginator(Post.objects.all(), 10)
+        cursor = encode_cursor(NEXT, Post.objects.all()[0])
+        with CaptureQueriesContext(connection) as queries:
+            len(paginator.cursor_page(cursor))
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0]['sql'])
+
+    def test_broken_cursor_returns_first_page(self):
+        response = self.guest_client.get(
+            reverse('posts:index') + '?cursor=broken')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['page_obj']), 10)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        Post.objects.bulk_create(
+            Post(text=f'Тестовый текст {i}', author=cls.user)
+            for i in range(13)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def paginator(self, count=None):
+        return EstimatedCountPaginator(Post.objects.all(), 10, count=count)
+
+    def test_small_feed_counted_exactly_in_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.paginator().count, 13)
+
+    @override_settings(POSTS_ESTIMATED_COUNT_THRESHOLD=5)
+    def test_large_feed_count_cached(self):
+        """Число постов большой ленты берётся из кеша, а не COUNT(*)."""
+        self.assertEqual(self.paginator().count, 13)
+        Post.objects.create(text='Новый пост', author=self.user)
+        self.assertEqual(self.paginator().count, 13)
+        cache.clear()
+        self.assertEqual(self.paginator().count, 14)
+
+    def test_known_count_skips_count_query(self):
+        paginator = self.paginator(count=13)
+        with self.assertNumQueries(1):
+            page = paginator.page(2)
+        self.assertEqual(len(page), 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_overestimated_last_page_falls_back_to_real_one(self):
+        paginator = self.paginator(count=100)
+        page = paginator.get_page(paginator.num_pages)
+        self.assertEqual(page.number, 2)
+        self.assertEqual(len(page), 3)
+        self.assertFalse(page.has_next())
+
+    def test_underestimated_count_keeps_next_page(self):
+        paginator = self.paginator(count=5)
+        page = paginator.get_page(1)
+        self.assertTrue(page.has_next())
+        self.assertEqual(paginator.get_page(2).object_list[-1].text,
+                         'Тестовый текст 0')
+
+    def test_last_page_link_in_template(self):
+        Post.objects.bulk_create(
+            Post(text='Ещё пост', author=self.user) for _ in range(30))
+        with override_settings(POSTS_ESTIMATED_COUNT_THRESHOLD=5):
+            response = Client().get(reverse('posts:index'))
+        self.assertContains(response, '?page=5')
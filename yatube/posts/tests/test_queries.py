@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.budgets import QueryBudget
+from posts import urls as posts_urls
+from posts.models import Group, Post
+from posts.tests.utils import QueryCountMixin
+
+User = get_user_model()
+
+
+class FeedQueriesTests(QueryCountMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(
+            title='группа0',
+            slug='test_slug0',
+            description='проверка описания0',
+        )
+        Post.objects.create(text='Тестовый текст', author=cls.user,
+                            group=cls.group)
+        cls.urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user.username}),
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def add_posts(self, count):
+        for i in range(count):
+            author = User.objects.create(username=f'author{i}')
+            group = Group.objects.create(title=f'группа{i + 1}',
+                                         slug=f'slug{i + 1}')
+            Post.objects.create(text='Тестовый текст', author=author,
+                                group=group)
+            Post.objects.create(text='Тестовый текст', author=self.user,
+                                group=self.group)
+
+    def test_feed_queries_do_not_depend_on_page_size(self):
+        """Число запросов ленты не растёт вместе с числом постов."""
+        before = {url: self.count_queries(self.guest_client, url)
+                  for url in self.urls}
+        self.add_posts(9)
+        for url in self.urls:
+            with self.subTest(url=url):
+                self.assertQueryBudget(self.guest_client, url, before[url])
+
+
+class ViewBudgetTests(QueryCountMixin, TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Test_User')
+        cls.group = Group.objects.create(
+            title='группа',
+            slug='test_slug',
+            description='проверка описания',
+        )
+        for i in range(15):
+            Post.objects.create(text=f'Тестовый текст {i}', author=cls.user,
+                                group=cls.group)
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.author_client = Client()
+        self.author_client.force_login(self.user)
+
+    def test_every_posts_view_fits_its_budget(self):
+        """Каждая страница posts укладывается в объявленный бюджет."""
+        kwargs = {
+            'slug': self.group.slug,
+            'username': self.user.username,
+            'post_id': self.post.pk,
+        }
+        for pattern in posts_urls.urlpatterns:
+            names = pattern.pattern.converters
+            url = reverse(f'posts:{pattern.name}',
+                          kwargs={name: kwargs[name] for name in names})
+            with self.subTest(url=url):
+                self.assertViewBudget(self.author_client, url)
+        self.assertViewBudget(self.author_client,
+                              reverse('posts:search') + '?q=текст')
+        self.assertViewBudget(self.author_client,
+                              reverse('posts:index') + '?page=2')
+
+    def test_budget_failure_lists_queries(self):
+        """Превышение бюджета показывает выполненные запросы."""
+        budget = QueryBudget(0)
+        with self.assertRaisesMessage(AssertionError, 'posts_post'):
+            with budget.check('posts'):
+                list(Post.objects.all())
@@ -0,0 +1,47 @@
+import pickle
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from posts.models import Group, Post
+from posts.records import FeedPost
+
+User = get_user_model()
+
+
+class FeedPostTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User',
+                                       first_name='Лев', last_name='Толстой')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        cls.post = Post.objects.create(text='Пост в группе', author=cls.user,
+                                       group=cls.group)
+        Post.objects.create(text='Пост без группы', author=cls.user)
+
+    def test_compact_rows_match_model(self):
+        """Записи ленты несут те же данные, что и модели."""
+        with self.assertNumQueries(1):
+            posts = list(Post.objects.compact().order_by('pk'))
+        record, without_group = posts
+        self.assertIsInstance(record, FeedPost)
+        self.assertEqual(record.pk, self.post.pk)
+        self.assertEqual(record.id, self.post.pk)
+        self.assertEqual(record.text, self.post.text)
+        self.assertEqual(record.pub_date, self.post.pub_date)
+        self.assertEqual(record.updated_at, self.post.updated_at)
+        self.assertEqual(record.author.username, 'Test_User')
+        self.assertEqual(record.author.get_full_name(),
+                         self.user.get_full_name())
+        self.assertEqual(record.group.slug, self.group.slug)
+        self.assertEqual(record.group.title, self.group.title)
+        self.assertEqual(str(record), str(self.post))
+        self.assertIsNone(without_group.group)
+
+    def test_records_use_slots(self):
+        record = Post.objects.compact().first()
+        self.assertFalse(hasattr(record, '__dict__'))
+        restored = pickle.loads(pickle.dumps(record))
+        self.assertEqual(restored.author.username, 'Test_User')
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.post = Post.objects.create(
+            text='Лев Толстой написал роман', author=cls.user)
+        Post.objects.create(text='Роман о войне и мире, роман о людях',
+                            author=cls.user)
+        Post.objects.create(text='Пост про котиков', author=cls.user)
+
+    def setUp(self):
+        self.guest_client = Client()
+
+    def search(self, query):
+        response = self.guest_client.get(reverse('posts:search'),
+                                         {'q': query})
+        return [post.text for post in response.context['page_obj']]
+
+    def test_search_finds_and_ranks_posts(self):
+        self.assertEqual(self.search('роман'), [
+            'Роман о войне и мире, роман о людях',
+            'Лев Толстой написал роман',
+        ])
+        self.assertEqual(self.search('котиков'), ['Пост про котиков'])
+
+    def test_search_index_follows_edit_and_delete(self):
+        self.post.text = 'Лев Толстой написал повесть'
+        self.post.save()
+        self.assertEqual(self.search('повесть'),
+                         ['Лев Толстой написал повесть'])
+        self.assertEqual(len(self.search('роман')), 1)
+        self.post.delete()
+        self.assertEqual(self.search('повесть'), [])
+
+    def test_query_syntax_is_escaped(self):
+        response = self.guest_client.get(reverse('posts:search'),
+                                         {'q': 'роман" OR NOT ('})
+        self.assertEqual(response.status_code, 200)
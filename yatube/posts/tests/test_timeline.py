@@ -0,0 +1,129 @@
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post
+from posts.tests.utils import run_on_commit
+from posts.timeline import TIMELINE_KEY, get_timeline
+
+User = get_user_model()
+
+
+@override_settings(POSTS_TIMELINE_ENABLED=True, POSTS_TIMELINE_SIZE=15)
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='Test_User')
+        cls.group = Group.objects.create(title='группа0', slug='test_slug0',
+                                         description='проверка описания0')
+        for i in range(20):
+            Post.objects.create(text=f'Пост номер {i}.', author=cls.user,
+                                group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.url = reverse('posts:index')
+
+    def page_texts(self, url):
+        response = self.guest_client.get(url)
+        return [post.text for post in response.context['page_obj']]
+
+    def test_first_pages_served_without_queries(self):
+        """Первые страницы главной собираются из ленты в кеше."""
+        self.guest_client.get(self.url)
+        with self.assertNumQueries(0):
+            response = self.guest_client.get(self.url)
+        self.assertContains(response, 'Пост номер 19.')
+        self.assertEqual(response.context['page_obj'].paginator.count, 20)
+
+    def test_pages_match_database_order(self):
+        for page in ('1', '2'):
+            with self.subTest(page=page):
+                url = f'{self.url}?page={page}'
+                from_timeline = self.page_texts(url)
+                with override_settings(POSTS_TIMELINE_ENABLED=False):
+                    self.assertEqual(from_timeline, self.page_texts(url))
+
+    def test_new_post_added_incrementally(self):
+        get_timeline()
+        with run_on_commit():
+            post = Post.objects.create(text='Свежий пост', author=self.user)
+        timeline = cache.get(TIMELINE_KEY)
+        self.assertEqual(timeline['keys'][0], (post.pub_date, post.pk))
+        self.assertEqual(len(timeline['keys']), 15)
+        self.assertEqual(timeline['count'], 21)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.page_texts(self.url)[0], 'Свежий пост')
+
+    def test_edited_and_deleted_posts(self):
+        get_timeline()
+        latest, previous = Post.objects.order_by('-pub_date', '-pk')[:2]
+        previous.text = 'Исправленный пост'
+        with run_on_commit():
+            previous.save()
+            latest.delete()
+        texts = self.page_texts(self.url)
+        self.assertEqual(texts[0], 'Исправленный пост')
+        self.assertEqual(cache.get(TIMELINE_KEY)['count'], 19)
+
+    def test_old_post_not_inserted_into_partial_timeline(self):
+        get_timeline()
+        oldest = Post.objects.order_by('pub_date').first()
+        with run_on_commit():
+            post = Post.objects.create(text='Старый пост', author=self.user)
+            post.pub_date = oldest.pub_date - timedelta(days=1)
+            post.save()
+        keys = cache.get(TIMELINE_KEY)['keys']
+        self.assertNotIn('Старый пост', [
+            Post.objects.get(pk=pk).text for _, pk in keys])
+
+    def test_author_rename_rebuilds_cards(self):
+        """Переименование автора не оставляет старое имя в ленте."""
+        self.guest_client.get(self.url)
+        self.user.first_name = 'Новое'
+        self.user.last_name = 'Имя'
+        with run_on_commit():
+            self.user.save()
+        self.assertIsNone(cache.get(TIMELINE_KEY))
+        self.assertContains(self.guest_client.get(self.url),
+                            'Автор: Новое Имя')
+        self.user.save(update_fields=['last_login'])
+        self.assertIsNotNone(cache.get(TIMELINE_KEY))
+
+    def test_changes_applied_after_commit(self):
+        """До коммита лента не меняется: её перестройка в другом запросе
+        не увидела бы пост, которого уже ждёт правка."""
+        get_timeline()
+        with run_on_commit():
+            Post.objects.create(text='Свежий пост', author=self.user)
+            self.assertEqual(cache.get(TIMELINE_KEY)['count'], 20)
+        self.assertEqual(cache.get(TIMELINE_KEY)['count'], 21)
+
+    @override_settings(POSTS_TIMELINE_TIMEOUT=60)
+    def test_timeline_expires(self):
+        """Лента, разошедшаяся с базой, живёт не дольше таймаута."""
+        get_timeline()
+        later = time.time() + 61
+        with mock.patch('django.core.cache.backends.locmem.time.time',
+                        return_value=later):
+            self.assertIsNone(cache.get(TIMELINE_KEY))
+
+    def test_deep_page_read_from_database(self):
+        get_timeline()
+        texts = self.page_texts(f'{self.url}?page=2')
+        self.assertEqual(texts[-1], 'Пост номер 0.')
+
+    def test_rebuild_command(self):
+        out = StringIO()
+        call_command('rebuild_timeline', stdout=out)
+        self.assertIn('В ленте 15 постов из 20', out.getvalue())
+        self.assertIsNotNone(cache.get(TIMELINE_KEY))
@@ -0,0 +1,72 @@
+import tempfile
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from core.budgets import get_query_budget
+
+
+class QueryCountMixin:
+    """Подсчёт SQL-запросов, которые выполняет страница."""
+
+    def count_queries(self, client, url):
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        return len(queries)
+
+    def assertQueryBudget(self, client, url, budget):
+        with CaptureQueriesContext(connection) as queries:
+            client.get(url)
+        self.assertLessEqual(
+            len(queries), budget,
+            '\n'.join(query['sql'] for query in queries)
+        )
+
+    def assertViewBudget(self, client, url):
+        """Страница укладывается в бюджет, объявленный на её view."""
+        budget = get_query_budget(urlsplit(url).path)
+        self.assertIsNotNone(budget, f'У view для {url} не задан бюджет')
+        with budget.check(url):
+            response = client.get(url)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        return response
+
+
+class SharedCacheMixin:
+    """Кеш в файлах вместо LocMemCache: общий для процессов.
+
+    Только с таким кешем страницы и фиды отдают Last-Modified.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cache_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cache_dir.cleanup)
+        shared = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': cache_dir.name,
+        }})
+        shared.enable()
+        cls.addClassCleanup(shared.disable)
+        super().setUpClass()
+
+
+@contextmanager
+def run_on_commit():
+    """Выполняет колбэки transaction.on_commit, добавленные в блоке.
+
+    TestCase не фиксирует транзакцию, и в Django 2.2 такие колбэки
+    в тестах иначе не выполняются (captureOnCommitCallbacks появился
+    только в 3.2).
+    """
+    start = len(connection.run_on_commit)
+    try:
+        yield
+    finally:
+        while len(connection.run_on_commit) > start:
+            _, callback = connection.run_on_commit.pop(start)
+            callback()
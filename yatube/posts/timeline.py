@@ -0,0 +1,194 @@
+"""Материализованная главная лента.
+
+В кеше лежат упорядоченный список ключей (pub_date, pk) последних
+settings.POSTS_TIMELINE_SIZE постов с общим числом постов и, под
+отдельными ключами, сами посты с уже отрисованной карточкой. Первые
+страницы главной собираются из них без сортировки таблицы Post.
+
+Сигналы Post меняют ленту точечно после коммита. Если другой процесс
+в это время тоже её меняет, лента сбрасывается и перестраивается при
+следующем запросе; после холодного старта её заранее строит команда
+rebuild_timeline. Перестройка может разминуться с правкой, поэтому
+лента живёт не дольше settings.POSTS_TIMELINE_TIMEOUT.
+"""
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import EmptyPage, PageNotAnInteger
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from .models import Post
+from .paginators import CursorPaginator
+
+TIMELINE_KEY = 'posts:timeline'
+LOCK_KEY = 'posts:timeline:lock'
+LOCK_TIMEOUT = 5
+
+
+class TimelinePaginator(CursorPaginator):
+    """Пагинатор, которому число постов известно из ленты."""
+
+    def __init__(self, object_list, per_page, count):
+        super().__init__(object_list, per_page)
+        self.count = count
+
+
+def timeline_cache():
+    return caches[settings.POSTS_PAGE_CACHE_ALIAS]
+
+
+def card_key(pk):
+    return f'posts:timeline:post:{pk}'
+
+
+def render_card(post):
+    post.card_html = render_to_string('posts/includes/post_card.html',
+                                      {'post': post})
+    return post
+
+
+def store_cards(posts):
+    timeline_cache().set_many(
+        {card_key(post.pk): render_card(post) for post in posts},
+        settings.POSTS_TIMELINE_TIMEOUT)
+
+
+def rebuild_timeline():
+    posts = list(Post.objects.compact().order_by('-pub_date', '-pk')[
+        :settings.POSTS_TIMELINE_SIZE])
+    store_cards(posts)
+    timeline = {
+        'count': Post.objects.count(),
+        'keys': [(post.pub_date, post.pk) for post in posts],
+    }
+    timeline_cache().set(TIMELINE_KEY, timeline,
+                         settings.POSTS_TIMELINE_TIMEOUT)
+    return timeline
+
+
+def get_timeline():
+    timeline = timeline_cache().get(TIMELINE_KEY)
+    if timeline is None:
+        timeline = rebuild_timeline()
+    return timeline
+
+
+def drop_timeline():
+    timeline_cache().delete(TIMELINE_KEY)
+
+
+def drop_timeline_on_commit():
+    transaction.on_commit(drop_timeline)
+
+
+def load_cards(keys):
+    """Посты с карточками в порядке ключей; недостающие берутся из БД."""
+    cached = timeline_cache().get_many([card_key(pk) for _, pk in keys])
+    posts = {post.pk: post for post in cached.values()}
+    missing = [pk for _, pk in keys if pk not in posts]
+    if missing:
+        loaded = list(Post.objects.compact().filter(pk__in=missing))
+        store_cards(loaded)
+        posts.update((post.pk, post) for post in loaded)
+    return [posts[pk] for _, pk in keys if pk in posts]
+
+
+def timeline_page(request, per_page):
+    """Страница главной из ленты или None, если её в ленте нет."""
+    if not settings.POSTS_TIMELINE_ENABLED or request.GET.get('cursor'):
+        return None
+    timeline = get_timeline()
+    keys = timeline['keys']
+    paginator = TimelinePaginator(Post.objects.compact(), per_page,
+                                  timeline['count'])
+    try:
+        number = paginator.validate_number(request.GET.get('page'))
+    except PageNotAnInteger:
+        number = 1
+    except EmptyPage:
+        number = paginator.num_pages
+    bottom = (number - 1) * per_page
+    top = min(bottom + per_page, timeline['count'])
+    if top > len(keys):
+        return None
+    return paginator._get_page(load_cards(keys[bottom:top]), number,
+                               paginator)
+
+
+@contextmanager
+def changing_timeline():
+    """Отдаёт ленту для правки и сохраняет её после блока.
+
+    Если ленты нет, отдаёт None. Если её уже правит другой процесс,
+    лента сбрасывается: перестроить её надёжнее, чем потерять правку.
+    """
+    cache = timeline_cache()
+    locked = cache.add(LOCK_KEY, True, LOCK_TIMEOUT)
+    try:
+        timeline = cache.get(TIMELINE_KEY)
+        if timeline is not None and not locked:
+            drop_timeline()
+            timeline = None
+        yield timeline
+        if timeline is not None:
+            cache.set(TIMELINE_KEY, timeline, settings.POSTS_TIMELINE_TIMEOUT)
+    finally:
+        if locked:
+            cache.delete(LOCK_KEY)
+
+
+def remove_key(keys, pk):
+    for position, (_, key_pk) in enumerate(keys):
+        if key_pk == pk:
+            del keys[position]
+            return True
+    return False
+
+
+def timeline_post_saved(post, created):
+    # До коммита перестройка ленты другим запросом не увидит пост,
+    # а правка поверх неё — уже увидит: меняем ленту после коммита.
+    if settings.POSTS_TIMELINE_ENABLED:
+        transaction.on_commit(partial(apply_post_saved, post.pk,
+                                      post.pub_date, created))
+
+
+def timeline_post_deleted(post):
+    if settings.POSTS_TIMELINE_ENABLED:
+        transaction.on_commit(partial(apply_post_deleted, post.pk))
+
+
+def apply_post_saved(pk, pub_date, created):
+    with changing_timeline() as timeline:
+        if timeline is None:
+            return
+        keys = timeline['keys']
+        remove_key(keys, pk)
+        if created:
+            timeline['count'] += 1
+        key = (pub_date, pk)
+        # Ключи ленты — ровно первые len(keys) постов, поэтому пост
+        # попадает в неё, если он новее последнего из них или в ленте
+        # и так лежат все остальные посты.
+        if keys and key < keys[-1] and len(keys) < timeline['count'] - 1:
+            timeline_cache().delete(card_key(pk))
+            return
+        position = next((number for number, other in enumerate(keys)
+                         if other < key), len(keys))
+        keys.insert(position, key)
+        for _, dropped_pk in keys[settings.POSTS_TIMELINE_SIZE:]:
+            timeline_cache().delete(card_key(dropped_pk))
+        del keys[settings.POSTS_TIMELINE_SIZE:]
+        store_cards(Post.objects.compact().filter(pk=pk))
+
+
+def apply_post_deleted(pk):
+    with changing_timeline() as timeline:
+        if timeline is None:
+            return
+        remove_key(timeline['keys'], pk)
+        timeline['count'] -= 1
+        timeline_cache().delete(card_key(pk))
@@ -1,12 +1,27 @@
 from django.urls import path
-from . import views
+from . import feeds, views
 app_name = 'posts'
 
 urlpatterns = [
     path('', views.index, name='index'),
+    path('groups/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path('fragment/', views.feed_fragment, name='index_fragment'),
+    path('group/<slug:slug>/fragment/', views.feed_fragment,
+         name='group_fragment'),
+    path('feed.json', feeds.feed_json, name='feed_json'),
+    path('feed.rss', feeds.feed_rss, name='feed_rss'),
+    path('group/<slug:slug>/feed.json', feeds.feed_json,
+         name='group_feed_json'),
+    path('group/<slug:slug>/feed.rss', feeds.feed_rss,
+         name='group_feed_rss'),
+    path('profile/<str:username>/feed.json', feeds.feed_json,
+         name='profile_feed_json'),
+    path('profile/<str:username>/feed.rss', feeds.feed_rss,
+         name='profile_feed_rss'),
+    path('search/', views.search, name='search'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
 ]
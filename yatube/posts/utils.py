@@ -0,0 +1,101 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.shortcuts import render
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import page_cache
+from .paginators import CursorPaginator, EstimatedCountPaginator
+
+NUM_OF_POSTS = 10
+NUM_OF_GROUPS = 50
+
+
+def paginate(request, post_list, per_page=NUM_OF_POSTS, view_name=None,
+             count=None):
+    """Страница ленты по ?cursor= или ?page=.
+
+    Для view из settings.POSTS_ESTIMATED_COUNT число постов не считается
+    точно: берётся count, если он известен, или оценка.
+    """
+    if settings.POSTS_ESTIMATED_COUNT.get(view_name):
+        paginator = EstimatedCountPaginator(post_list, per_page, count=count)
+    else:
+        paginator = CursorPaginator(post_list, per_page)
+    cursor = request.GET.get('cursor')
+    if cursor:
+        return paginator.get_cursor_page(cursor)
+    return paginator.get_page(request.GET.get('page'))
+
+
+def page_validators(page_obj):
+    """Версия страницы ленты: её посты, их правки и размер ленты.
+
+    Имя автора и slug группы тоже входят: их правки видны в карточках,
+    но не трогают updated_at поста.
+    """
+    validators = [
+        (post.pk, post.updated_at.timestamp(), post.author.username,
+         post.author.get_full_name(), post.group and post.group.slug)
+        for post in page_obj
+    ]
+    if page_obj.number is None:
+        return validators + [page_obj.has_next(), page_obj.has_previous()]
+    return validators + [page_obj.paginator.count]
+
+
+def render_conditional(request, template, context, validators,
+                       last_modified=None, using=None):
+    """render(), отвечающий 304, если у клиента уже есть эта версия.
+
+    В ETag входит и пользователь: шапка страницы у каждого своя.
+    """
+    raw = repr([request.user.pk, *validators]).encode()
+    etag = quote_etag(hashlib.md5(raw).hexdigest())
+    if last_modified is not None:
+        last_modified = int(last_modified.timestamp())
+    response = get_conditional_response(request, etag=etag,
+                                        last_modified=last_modified)
+    if response is None:
+        response = render(request, template, context, using=using)
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+def page_last_modified(page_obj, scopes):
+    """Last-Modified страницы ленты.
+
+    Одних дат видимых постов мало: после удаления самого свежего поста
+    они уходят в прошлое. Поэтому берётся и время сброса областей ленты,
+    которое сигналы двигают при любой записи, включая удаление.
+    """
+    return scoped_last_modified([post.updated_at for post in page_obj],
+                                scopes)
+
+
+def scoped_last_modified(dates, scopes):
+    """Последняя из дат и времени сброса областей, или None.
+
+    Отметки сброса лежат в кеше POSTS_PAGE_CACHE_ALIAS. Если он у
+    каждого процесса свой, удаление в одном процессе не сдвинет отметку
+    в другом, и тот ответит 304 на устаревший If-Modified-Since. Тогда
+    Last-Modified не отдаётся совсем — остаётся ETag.
+    """
+    if not page_cache.spans_processes:
+        return None
+    return settled(max([*dates, page_cache.changed_at(scopes)]))
+
+
+def settled(last_modified):
+    """Last-Modified или None, если он попадает в текущую секунду.
+
+    If-Modified-Since точен до секунды: правка в ту же секунду, что
+    и выданная версия, иначе дала бы клиенту ошибочный 304.
+    """
+    if time.time() - last_modified.timestamp() < 1:
+        return None
+    return last_modified
@@ -1,66 +1,161 @@
+from django.conf import settings
 from django.core.paginator import Paginator
+from django.db.models import OuterRef, Subquery
+from django.http import Http404, HttpResponse, JsonResponse
+from django.template.loader import render_to_string
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from core.budgets import query_budget
+from users.models import get_posts_count
+from .cache import (author_scopes, cache_feed, group_index_scopes,
+                    group_scopes, index_scopes)
 from .models import Post, Group, User
 from .forms import PostForm
+from .paginators import CursorPaginator
+from .search import search_posts
+from .timeline import timeline_page
+from .utils import (NUM_OF_GROUPS, NUM_OF_POSTS, page_last_modified,
+                    page_validators, paginate, render_conditional,
+                    scoped_last_modified)
 
 
-NUM_OF_POSTS = 10
-
-
+@query_budget(4)
+@cache_feed('index', index_scopes)
 def index(request):
     text = 'Последние обновления на сайте'
-    post_list = Post.objects.all()
-    paginator = Paginator(post_list, NUM_OF_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    page_obj = timeline_page(request, NUM_OF_POSTS)
+    if page_obj is None:
+        page_obj = paginate(request, Post.objects.compact(), view_name='index')
     context = {'page_obj': page_obj, 'text': text}
     template = 'posts/index.html'
-    return render(request, template, context)
+    return render_conditional(request, template, context,
+                              page_validators(page_obj),
+                              page_last_modified(page_obj, index_scopes()),
+                              using=settings.POSTS_TEMPLATE_ENGINE)
 
 
+@query_budget(5)
+@cache_feed('group_list', group_scopes)
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    post_list = group.posts.all()
-    paginator = Paginator(post_list, NUM_OF_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    post_list = group.posts.compact()
+    page_obj = paginate(request, post_list, view_name='group_list',
+                        count=group.posts_count)
     context = {
         'page_obj': page_obj,
         'group': group,
     }
-    return render(request, 'posts/group_list.html', context)
+    validators = [group.title, group.description,
+                  *page_validators(page_obj)]
+    last_modified = page_last_modified(page_obj, group_scopes(slug))
+    return render_conditional(request, 'posts/group_list.html', context,
+                              validators, last_modified,
+                              using=settings.POSTS_TEMPLATE_ENGINE)
 
 
+@query_budget(5)
+@cache_feed('group_index', group_index_scopes)
+def group_index(request):
+    page_obj = Paginator(Group.objects.order_by('title', 'pk'),
+                         NUM_OF_GROUPS).get_page(request.GET.get('page'))
+    # Время последнего поста — подзапрос по индексу (group, -pub_date)
+    # отдельным запросом только для групп страницы: в COUNT(*) и
+    # в сортировку по title он бы попал для каждой группы.
+    last_post = Post.objects.filter(group=OuterRef('pk')).order_by(
+        '-pub_date').values('pub_date')[:1]
+    last_posts = dict(Group.objects.filter(
+        pk__in=[group.pk for group in page_obj]
+    ).annotate(last_post_at=Subquery(last_post)).values_list(
+        'pk', 'last_post_at'))
+    for group in page_obj:
+        group.last_post_at = last_posts.get(group.pk)
+    return render(request, 'posts/group_index.html', {'page_obj': page_obj})
+
+
+@query_budget(5)
+@cache_feed('profile', author_scopes)
 def profile(request, username):
-    profile = get_object_or_404(User, username=username)
-    post_list = (
-        Post.objects.select_related("author", "group")
-        .filter(author=profile).all()
-    )
-    posts_count = post_list.count()
-    paginator = Paginator(post_list, NUM_OF_POSTS)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    profile = get_object_or_404(User.objects.select_related('profile'),
+                                username=username)
+    post_list = profile.posts.compact()
+    posts_count = get_posts_count(profile)
+    page_obj = paginate(request, post_list, view_name='profile',
+                        count=posts_count)
     context = {
         'profile': profile,
         'posts_count': posts_count,
         'page_obj': page_obj,
     }
-    return render(request, 'posts/profile.html', context)
+    validators = [profile.get_full_name(), posts_count,
+                  *page_validators(page_obj)]
+    last_modified = page_last_modified(page_obj, author_scopes(username))
+    return render_conditional(request, 'posts/profile.html', context,
+                              validators, last_modified,
+                              using=settings.POSTS_TEMPLATE_ENGINE)
 
 
+@query_budget(2)
+def feed_fragment(request, slug=None):
+    """Следующие карточки ленты для бесконечной прокрутки.
+
+    Отдаёт только HTML карточек после курсора, без base.html. С
+    ?format=json — HTML и курсор следующей порции в JSON, иначе курсор
+    приходит в заголовке X-Next-Cursor.
+    """
+    post_list = Post.objects.compact()
+    if slug is not None:
+        post_list = post_list.filter(group__slug=slug)
+    page_obj = CursorPaginator(post_list, NUM_OF_POSTS).get_cursor_page(
+        request.GET.get('cursor', ''))
+    # Группу проверяем, только если порция пуста: непустая уже значит,
+    # что группа есть, и лишнего запроса не будет.
+    if (slug is not None and not len(page_obj)
+            and not Group.objects.filter(slug=slug).exists()):
+        raise Http404
+    next_cursor = page_obj.next_cursor
+    html = render_to_string('posts/includes/post_cards.html',
+                            {'page_obj': page_obj}, request,
+                            using=settings.POSTS_TEMPLATE_ENGINE)
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'html': html, 'next_cursor': next_cursor})
+    response = HttpResponse(html)
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
+
+
+@query_budget(3)
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    post_list = (
-        Post.objects.select_related("author", "group")
-        .filter(author=post.author).all()
+    post = get_object_or_404(
+        Post.objects.for_feed().select_related('author__profile'),
+        pk=post_id
     )
-    posts_count = post_list.count()
+    posts_count = get_posts_count(post.author)
     context = {'post': post, 'posts_count': posts_count, }
-    return render(request, 'posts/post_detail.html', context)
+    validators = [post.updated_at.timestamp(), posts_count,
+                  post.author.username,
+                  post.group and (post.group.slug, post.group.title)]
+    # Число постов автора, его имя и группа не трогают updated_at поста,
+    # зато их правки сбрасывают области автора и группы.
+    scopes = author_scopes(post.author.username)
+    if post.group:
+        scopes += group_scopes(post.group.slug)
+    last_modified = scoped_last_modified([post.updated_at], scopes)
+    return render_conditional(request, 'posts/post_detail.html', context,
+                              validators, last_modified)
+
+
+@query_budget(4)
+def search(request):
+    query = request.GET.get('q', '').strip()
+    post_list = search_posts(query) if query else Post.objects.none()
+    paginator = Paginator(post_list, NUM_OF_POSTS)
+    page_obj = paginator.get_page(request.GET.get('page'))
+    context = {'page_obj': page_obj, 'q': query}
+    return render(request, 'posts/search.html', context)
 
 
+@query_budget(3)
 @login_required
 def post_create(request):
     form = PostForm(request.POST or None)
@@ -72,6 +167,7 @@ def post_create(request):
     return render(request, 'posts/create_post.html', {'form': form})
 
 
+@query_budget(5)
 @login_required
 def post_edit(request, post_id):
     is_edit = True
@@ -0,0 +1,44 @@
+// Бесконечная лента: когда пагинатор показывается на экране, следующие
+// посты подгружаются фрагментом и дописываются в конец списка. Без
+// JavaScript страница листается обычным пагинатором.
+(function () {
+  var list = document.querySelector('[data-fragment-url]');
+  var nav = document.querySelector('nav[aria-label="Page navigation"]');
+  if (!list || !nav || !list.dataset.nextCursor
+      || !('IntersectionObserver' in window) || !window.fetch) {
+    return;
+  }
+  var pagination = nav.querySelector('.pagination');
+  var loading = false;
+  var observer = new IntersectionObserver(function (entries) {
+    if (!entries[0].isIntersecting || loading) {
+      return;
+    }
+    loading = true;
+    var url = list.dataset.fragmentUrl + '?format=json&cursor='
+      + encodeURIComponent(list.dataset.nextCursor);
+    fetch(url, {credentials: 'same-origin'})
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.statusText);
+        }
+        return response.json();
+      })
+      .then(function (data) {
+        list.insertAdjacentHTML('beforeend', data.html);
+        list.dataset.nextCursor = data.next_cursor || '';
+        if (!data.next_cursor) {
+          observer.disconnect();
+          nav.hidden = true;
+        }
+        loading = false;
+      })
+      .catch(function () {
+        // Возвращаем обычный пагинатор.
+        observer.disconnect();
+        pagination.hidden = false;
+      });
+  });
+  pagination.hidden = true;
+  observer.observe(nav);
+})();
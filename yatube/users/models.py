@@ -0,0 +1,22 @@
+from django.contrib.auth import get_user_model
+from django.db import models
+
+User = get_user_model()
+
+
+class Profile(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='profile'
+    )
+    posts_count = models.PositiveIntegerField(default=0, editable=False)
+
+    def __str__(self):
+        return str(self.user)
+
+
+def get_posts_count(user):
+    """Число постов автора по счётчику, без COUNT(*) по таблице постов."""
+    profile = getattr(user, 'profile', None)
+    return profile.posts_count if profile else 0
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/2.2/ref/settings/
 """
 
 import os
+import sys
 
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,8 +23,12 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = '_fy3_vs(4+t-oik@(a$k+!_97t88x=ru)=drc&z*q0efwaj9i%'
 
+# Профиль развёртывания: YATUBE_PROFILE=production выключает DEBUG,
+# включает кеширующий загрузчик шаблонов и профиль базы production.
+PROFILE = os.environ.get('YATUBE_PROFILE', 'default')
+
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = PROFILE != 'production'
 
 ALLOWED_HOSTS = ['*']
 
@@ -44,11 +49,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.ReplicaMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -79,6 +86,33 @@ TEMPLATES = [
     }
 ]
 
+# Кеширующий загрузчик разбирает каждый шаблон один раз на процесс,
+# а TEMPLATES_PRECOMPILE разбирает их все при запуске WSGI-приложения.
+TEMPLATES_PRECOMPILE = False
+if PROFILE == 'production':
+    TEMPLATES[0]['APP_DIRS'] = False
+    TEMPLATES[0]['OPTIONS']['loaders'] = [
+        ('django.template.loaders.cached.Loader', [
+            'django.template.loaders.filesystem.Loader',
+            'django.template.loaders.app_directories.Loader',
+        ]),
+    ]
+    TEMPLATES_PRECOMPILE = True
+
+# Движок шаблонов лент (главная, группа, профиль): 'django' или 'jinja2'.
+# Для Jinja2 нужен пакет Jinja2, её шаблоны лежат в jinja2/.
+POSTS_TEMPLATE_ENGINE = os.environ.get('YATUBE_TEMPLATE_ENGINE', 'django')
+if POSTS_TEMPLATE_ENGINE == 'jinja2':
+    TEMPLATES.append({
+        'BACKEND': 'django.template.backends.jinja2.Jinja2',
+        'DIRS': [os.path.join(BASE_DIR, 'jinja2')],
+        'OPTIONS': {
+            'environment': 'core.jinja2.environment',
+            'context_processors': TEMPLATES[0]['OPTIONS'][
+                'context_processors'],
+        },
+    })
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
 
@@ -92,6 +126,107 @@ DATABASES = {
     }
 }
 
+# Профиль базы: YATUBE_DB_PROFILE=production включает постоянные
+# соединения и PRAGMA для конкурентной нагрузки (WAL, ожидание блокировки
+# вместо "database is locked", mmap и кеш страниц побольше).
+# По умолчанию совпадает с YATUBE_PROFILE.
+DB_PROFILE = os.environ.get('YATUBE_DB_PROFILE', PROFILE)
+SQLITE_PRAGMAS = {}
+if DB_PROFILE == 'production':
+    DATABASES['default']['CONN_MAX_AGE'] = 600
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    }
+
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
+# Реплики для чтения — алиасы из DATABASES. Для локальной проверки
+# хватит копии базы: YATUBE_REPLICA_DB=/path/to/replica.sqlite3.
+# Под тестами алиас есть всегда, но чтение через него включает только
+# core.tests.test_routers: остальным тестам хватает default.
+REPLICA_DATABASES = []
+if os.environ.get('YATUBE_REPLICA_DB') or TESTING:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ.get('YATUBE_REPLICA_DB',
+                               os.path.join(BASE_DIR, 'replica.sqlite3')),
+        'CONN_MAX_AGE': DATABASES['default'].get('CONN_MAX_AGE', 0),
+        'TEST': {'MIRROR': 'default'},
+    }
+    if not TESTING:
+        REPLICA_DATABASES.append('replica')
+
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+
+# Страницы, которые читают из реплик, и сколько секунд после записи
+# пользователь читает из default
+REPLICA_READ_VIEWS = [
+    'posts:index',
+    'posts:group_index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'posts:index_fragment',
+    'posts:group_fragment',
+    'about:author',
+    'about:tech',
+]
+REPLICA_PIN_COOKIE = 'use_primary'
+REPLICA_PIN_SECONDS = 10
+
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Кеш страниц лент для анонимных посетителей: включается для каждой view
+# отдельно. Локальный LRU процесса стоит перед общим кешем из CACHES.
+POSTS_PAGE_CACHE = {
+    'index': False,
+    'group_list': False,
+    'profile': False,
+    'group_index': False,
+}
+# В этом же кеше лежат отметки сброса областей, из которых страницы
+# и фиды берут Last-Modified. С кешем в памяти процесса (LocMemCache)
+# удаление в одном процессе не видно другим, поэтому Last-Modified
+# отдаётся только с общим кешем (Memcached, Redis, база); иначе
+# условный GET работает по одному ETag.
+POSTS_PAGE_CACHE_ALIAS = 'default'
+POSTS_PAGE_CACHE_TIMEOUT = 60 * 5
+POSTS_PAGE_CACHE_LOCAL_SIZE = 500
+
+# Ленты, где пагинатор не считает COUNT(*): счётчики групп и авторов
+# или оценка, которая кешируется для лент длиннее порога
+POSTS_ESTIMATED_COUNT = {
+    'index': True,
+    'group_list': True,
+    'profile': True,
+}
+POSTS_ESTIMATED_COUNT_THRESHOLD = 10000
+POSTS_ESTIMATED_COUNT_TIMEOUT = 60
+
+# Материализованная главная лента: последние посты с готовыми карточками
+# в кеше POSTS_PAGE_CACHE_ALIAS, из которых собираются первые страницы.
+# Время жизни ограничивает, сколько лента может расходиться с базой,
+# если правка разминулась с её перестройкой.
+POSTS_TIMELINE_ENABLED = False
+POSTS_TIMELINE_SIZE = 100
+POSTS_TIMELINE_TIMEOUT = 60
+
+
+# Доля запросов, для которых MetricsMiddleware замеряет время и SQL,
+# и размер выборки для квантилей на /metrics
+METRICS_SAMPLE_RATE = 0.05
+METRICS_RESERVOIR_SIZE = 1024
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators